@@ -0,0 +1,40 @@
+import common
+import settings
+from animation import PLAYER_CHOMP
+from simulation import Simulation
+
+SECONDS = 2
+
+def frames_shown(tick_rate, fps):
+    # Which chomp frame each rendered frame shows over SECONDS of play at this tick rate and FPS
+    settings.TICK_RATE = tick_rate
+    simulation = Simulation(headless=False)
+    shown = []
+    for frame in range(SECONDS * fps):
+        while simulation.tick < (frame + 1) * tick_rate // fps:
+            simulation.step("left")
+        shown.append(PLAYER_CHOMP.frame_at(simulation.time))
+    return shown
+
+def main():
+    simulation = Simulation(headless=False)
+    player = simulation.player
+    rows = [
+        ("frame_at", f"{common.time_per_call(lambda: PLAYER_CHOMP.frame_at(12.345), 100000) * 1e9:.0f} ns"),
+        ("Player.animate", f"{common.time_per_call(lambda: player.animate(12.345), 100000) * 1e9:.0f} ns"),
+    ]
+    common.print_table(("call", "time"), rows)
+
+    # Frame changes per second should be 10 whatever the tick rate or frame rate
+    tick_rate = settings.TICK_RATE
+    rows = []
+    for rate in (30, 60, 120, 240):
+        for fps in (30, 60, 144):
+            shown = frames_shown(rate, fps)
+            changes = sum(1 for before, after in zip(shown, shown[1:]) if before != after)
+            rows.append((rate, fps, f"{changes / SECONDS:.1f}"))
+    settings.TICK_RATE = tick_rate
+    common.print_table(("tick rate", "fps", "frame changes/s"), rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import sys
+import common
+import settings
+from modes import FRIGHTENED
+
+TICKS = 3000
+
+class TickCountedChomp:
+    # The player animation before Animation: the frame advanced on every 6th update
+    def __init__(self, frame_count, delay=6):
+        self.frame_count = frame_count
+        self.delay = delay
+        self.timer = 0
+        self.index = 0
+
+    def update(self):
+        self.timer += 1
+        if self.timer >= self.delay:
+            self.timer = 0
+            self.index = (self.index + 1) % self.frame_count
+
+def main():
+    # At 60 ticks per second the time-based schedule has to pick the very image the tick
+    # counter did, frame for frame, through the game's own draw path
+    settings.TICK_RATE = 60
+    game = common.create_game()
+    game.show_main_menu = False
+    settings.SHOW_FPS = False
+    game.init_game_objects()
+    simulation = game.simulation
+    player = simulation.player
+    legacy = TickCountedChomp(len(player.frames[player.direction]))
+    error = None
+    frightened = 0
+    for tick, direction in enumerate(common.random_walk(TICKS, 0)):
+        simulation.step(direction)
+        legacy.update()
+        game.draw_frame()
+        game.renderer.present(game.screen)
+        if player.image is not player.frames[player.direction][legacy.index]:
+            error = f"tick {tick}: the player shows another chomp frame than the tick counter did"
+            break
+        for ghost in simulation.ghosts:
+            if not game.camera.visible(ghost.rect.inflate(settings.TILE_SIZE, settings.TILE_SIZE)):
+                continue  # Culled ghosts are not animated
+            expected = ghost.frightened_frames[0] if ghost.mode == FRIGHTENED else ghost.frames[ghost.direction][0]
+            if ghost.image is not expected:
+                error = f"tick {tick}: a ghost shows the wrong image"
+                break
+        if error:
+            break
+        frightened += simulation.mode_scheduler.mode == FRIGHTENED
+    common.print_table(("ticks", "frightened ticks", "result"), [(TICKS, frightened, error or "match")])
+    return 1 if error else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
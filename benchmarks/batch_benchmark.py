@@ -0,0 +1,36 @@
+import os
+import time
+import common
+import settings
+import batch
+from policies import create_policy
+from simulation import Simulation
+
+GAMES = 200
+TICKS = 60 * 60
+
+def fresh_games(jobs):
+    # The naive loop: a new Simulation, and so a new level load, for every game
+    for job in jobs:
+        simulation = Simulation(job["level"], seed=job["seed"])
+        simulation.end_on_death = True
+        policy = create_policy(job["policy"], job["seed"])
+        while simulation.tick < job["ticks"] and not simulation.dead and simulation.pellets.remaining:
+            simulation.step(policy(simulation))
+
+def main():
+    jobs = batch.create_jobs([settings.LEVEL_FILE], ["random"], GAMES, TICKS)
+    runs = [("fresh simulation per game", 1, lambda: fresh_games(jobs))]
+    for workers in sorted({0, 1, 2, os.cpu_count() or 1}):
+        runs.append((f"batch, {workers or 'no'} workers", max(workers, 1), lambda workers=workers: list(batch.run_batch(jobs, workers))))
+    rows = []
+    for name, processes, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        rows.append((name, processes, f"{elapsed:.2f}", f"{GAMES / elapsed:.1f}"))
+    common.print_table(("runner", "processes", "s", "games/s"), rows)
+    print(f"{GAMES} games of up to {TICKS} ticks, random policy, {os.cpu_count()} CPUs")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import common
+import os
+import random
+import tempfile
+import time
+import settings
+
+MAP_SIZES = [(28, 31), (224, 248), (896, 992)]
+GHOSTS = 200
+FRAMES = 600
+
+def write_level(directory, width, height):
+    level = common.generate_level(width, height)
+    level[1][1] = 'p'
+    rng = random.Random(width)
+    # Spawn tiles for the four named ghosts; extra ghosts are added later
+    for tile, (x, y) in zip("BPIC", rng.sample(common.open_tiles(level)[1:], 4)):
+        level[y][x] = tile
+    file_path = os.path.join(directory, f"level-{width}x{height}.txt")
+    with open(file_path, 'w') as file:
+        file.write("\n".join("".join(row) for row in level) + "\n")
+    return file_path
+
+def main():
+    settings.LEVEL_CACHE_DIR = tempfile.mkdtemp()
+    directory = tempfile.mkdtemp()
+    rows = []
+    for width, height in MAP_SIZES:
+        settings.LEVEL_FILE = write_level(directory, width, height)
+        game = common.create_game()
+        game.show_main_menu = False
+        simulation = game.simulation
+        from sprites.ghosts import Blinky
+        rng = random.Random(GHOSTS)
+        for x, y in rng.choices(common.open_tiles(simulation.level), k=GHOSTS):
+            simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE))
+        game.draw()  # First frame renders the chunks around the spawn
+        elapsed = 0
+        for frame in range(FRAMES):
+            # Run right along the top corridor so the camera keeps scrolling into new chunks
+            simulation.step("right")
+            start = time.perf_counter()
+            game.draw()
+            elapsed += time.perf_counter() - start
+        rows.append((
+            f"{width}x{height}", int(simulation.walls.sum()), len(simulation.ghosts),
+            f"{elapsed / FRAMES * 1e3:.3f}", game.maze_layer.builds, len(game.maze_layer.chunks)
+        ))
+    common.print_table(("map", "walls", "ghosts", "draw ms/frame", "chunk renders", "chunks cached"), rows)
+
+if __name__ == '__main__':
+    main()
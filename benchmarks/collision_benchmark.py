@@ -0,0 +1,83 @@
+import random
+import common
+import pygame
+import settings
+from collision import CollisionGrid
+from sprites.ghosts import Ghost
+
+MAP_SIZES = [(28, 31), (56, 62), (112, 124), (224, 248)]
+ENTITY_COUNTS = [5, 50, 500]
+FRAMES = 20
+
+def wall_group(level):
+    walls = pygame.sprite.Group()
+    for y, row in enumerate(level):
+        for x, tile in enumerate(row):
+            if tile in ('1', '2'):
+                size = settings.TILE_SIZE
+                wall = pygame.sprite.Sprite()
+                wall.rect = pygame.Rect(x * size, y * size, size, size)
+                walls.add(wall)
+    return walls
+
+def group_move(sprite, movement, walls):
+    # The spritecollideany path Player.move and Ghost.move used before CollisionGrid
+    sprite.rect.x += movement.x
+    collision = pygame.sprite.spritecollideany(sprite, walls)
+    if collision:
+        if movement.x > 0:
+            sprite.rect.right = collision.rect.left
+        elif movement.x < 0:
+            sprite.rect.left = collision.rect.right
+    sprite.rect.y += movement.y
+    collision = pygame.sprite.spritecollideany(sprite, walls)
+    if collision:
+        if movement.y > 0:
+            sprite.rect.bottom = collision.rect.top
+        elif movement.y < 0:
+            sprite.rect.top = collision.rect.bottom
+
+def make_entities(level, count):
+    rng = random.Random(count)
+    tiles = common.open_tiles(level)
+    entities = []
+    for _ in range(count):
+        x, y = rng.choice(tiles)
+        ghost = Ghost(x * settings.TILE_SIZE, y * settings.TILE_SIZE, "blinky", (0, 0), headless=True)
+        ghost.direction = rng.choice(["up", "down", "left", "right"])
+        ghost.calculate_movement()
+        entities.append(ghost)
+    return entities
+
+def main():
+    delta_time = 1 / settings.TICK_RATE
+    rows = []
+    for width, height in MAP_SIZES:
+        level = common.generate_level(width, height)
+        walls = wall_group(level)
+        grid = CollisionGrid(common.wall_plane(level))
+        for count in ENTITY_COUNTS:
+            entities = make_entities(level, count)
+
+            def grid_frame():
+                for entity in entities:
+                    entity.move(entity.velocity * delta_time, grid)
+
+            def group_frame():
+                for entity in entities:
+                    group_move(entity, entity.velocity * delta_time, walls)
+
+            grid_time = common.time_per_call(grid_frame, FRAMES)
+            group_time = common.time_per_call(group_frame, 2 if len(walls) * count > 1e6 else FRAMES, repeat=1)
+            rows.append((
+                f"{width}x{height}", len(walls), count,
+                f"{grid_time * 1e3:.3f}", f"{grid_time / count * 1e6:.2f}",
+                f"{group_time * 1e3:.3f}", f"{group_time / count * 1e6:.2f}",
+            ))
+    common.print_table(
+        ("map", "walls", "entities", "grid ms/frame", "grid us/entity", "group ms/frame", "group us/entity"),
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import random
+import sys
+import common
+import pygame
+import settings
+from collision import WALL_TILES
+
+TICKS = 1000
+PROBES = 8  # Extra rects per actor per tick, nudged around it to hit walls from every side
+
+def wall_group(level):
+    # One sprite per wall tile, what collisions were checked against before CollisionGrid
+    size = settings.TILE_SIZE
+    group = pygame.sprite.Group()
+    for y, row in enumerate(level):
+        for x, tile in enumerate(row):
+            if tile in WALL_TILES:
+                sprite = pygame.sprite.Sprite()
+                sprite.rect = pygame.Rect(x * size, y * size, size, size)
+                group.add(sprite)
+    return group
+
+def check(level_file, seed):
+    simulation = common.create_simulation(20, seed, level_file)
+    walls = wall_group(simulation.level)
+    grid = simulation.collision_grid
+    probe = pygame.sprite.Sprite()
+    rng = random.Random(seed)
+    size = settings.TILE_SIZE
+    compared = collisions = 0
+    for tick, direction in enumerate(common.random_walk(TICKS, seed)):
+        simulation.step(direction)
+        simulation.sync_ghosts()
+        for actor in [simulation.player] + list(simulation.ghosts):
+            for index in range(PROBES + 1):
+                probe.rect = actor.rect.move(rng.randint(-size, size), rng.randint(-size, size)) if index else actor.rect
+                hit = pygame.sprite.spritecollideany(probe, walls)
+                expected = hit.rect if hit else None
+                actual = grid.collide(probe.rect)
+                compared += 1
+                collisions += expected is not None
+                if actual != expected:
+                    return f"tick {tick}: {probe.rect} hits {actual}, spritecollideany has {expected}", compared, collisions
+    return None, compared, collisions
+
+def main():
+    failures = 0
+    rows = []
+    for name, level_file in (("level-1", None), ("56x62", common.write_level(56, 62))):
+        error, compared, collisions = check(level_file, 0)
+        failures += error is not None
+        rows.append((name, compared, collisions, error or "match"))
+    common.print_table(("level", "rects", "collisions", "result"), rows)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
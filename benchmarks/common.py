@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# Asset and level paths are relative to the repository root
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+def generate_level(width, height):
+    # Border of '2', a lattice of 2x2 '1' blocks and pellets everywhere else
+    level = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            if x in (0, width - 1) or y in (0, height - 1):
+                row.append('2')
+            elif x % 4 in (2, 3) and y % 4 in (2, 3):
+                row.append('1')
+            else:
+                row.append('.')
+        level.append(row)
+    return level
+
+def open_tiles(level):
+    return [(x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile not in ('1', '2')]
+
+def wall_plane(level):
+    # The compiled wall plane for a generated level: 1 on walls
+    return np.array([[tile in ('1', '2') for tile in row] for row in level], dtype=np.uint8)
+
+def write_level(width, height, seed=0):
+    level = generate_level(width, height)
+    rng = random.Random(seed)
+    for tile, (x, y) in zip("pBPIC", rng.sample(open_tiles(level), 5)):
+        level[y][x] = tile
+    file_path = os.path.join(tempfile.mkdtemp(), f"level-{width}x{height}.txt")
+    with open(file_path, 'w') as file:
+        file.write("\n".join("".join(row) for row in level) + "\n")
+    return file_path
+
+def random_walk(ticks, seed=0, directions=("left", "right", "up", "down")):
+    # A fixed recording of held directions: long straight runs with an occasional turn
+    rng = random.Random(seed)
+    direction = "left"
+    walk = []
+    for _ in range(ticks):
+        if rng.random() < 0.03:
+            direction = rng.choice(directions)
+        walk.append(direction)
+    return walk
+
+def create_simulation(extra_ghosts=0, seed=0, level_file=None, **options):
+    # A Simulation with extra Blinkys on random open tiles, the same ones for the same seed
+    import settings
+    from simulation import Simulation
+    from sprites.ghosts import Blinky
+    simulation = Simulation(level_file, seed=seed, **options)
+    rng = random.Random(seed)
+    for x, y in rng.choices(open_tiles(simulation.level), k=extra_ghosts):
+        simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE, simulation.headless))
+    return simulation
+
+def time_per_call(function, calls, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
+
+def create_game():
+    import pygame
+    import settings
+    pygame.init()
+    # The dummy driver only reports its own mode; the resolution selector needs it in the list
+    settings.RESOLUTION = pygame.display.list_modes()[0]
+    from game import Game
+    return Game()
@@ -0,0 +1,34 @@
+import time
+import common
+import settings
+
+FRAMES = 1200
+
+def play(game, dirty):
+    # The same recorded run twice, once pushing dirty rects and once flipping every frame
+    settings.DIRTY_RECTS = dirty
+    game.init_game_objects()
+    directions = ["left"] * 200 + ["up"] * 200 + ["right"] * 400 + ["down"] * 400
+    elapsed = 0
+    pixels = 0
+    for frame in range(FRAMES):
+        game.simulation.step(directions[frame])
+        start = time.perf_counter()
+        game.draw_frame()
+        game.renderer.present(game.screen)
+        elapsed += time.perf_counter() - start
+        pixels += game.renderer.pixels_pushed
+    return elapsed / FRAMES, pixels / FRAMES
+
+def main():
+    game = common.create_game()
+    game.show_main_menu = False
+    settings.SHOW_FPS = False
+    rows = []
+    for name, dirty in (("full flip", False), ("dirty rects", True)):
+        frame_time, pixels = play(game, dirty)
+        rows.append((name, f"{frame_time * 1e3:.3f}", f"{pixels:.0f}", f"{pixels / (game.screen.get_width() * game.screen.get_height()) * 100:.2f}%"))
+    common.print_table(("mode", "draw+present ms/frame", "pixels pushed/frame", "of screen"), rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import sys
+import common
+import pygame
+import settings
+
+FRAMES = 3000
+LEVELS = [("level-1", None), ("112x124", (112, 124))]
+LEVEL_FILE = settings.LEVEL_FILE
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+def full_frame(game):
+    # What a full redraw of the current state looks like. Every surface draw() paints is put back
+    # afterwards, so stale pixels the dirty path left behind are not repaired for it
+    surfaces = [game.screen, game.game_surface, game.map_area_surface, game.top_ui_surface, game.bottom_ui_surface]
+    saved = [surface.copy() for surface in surfaces]
+    game.draw()
+    frame = pixels(game.screen)
+    for surface, copy in zip(surfaces, saved):
+        surface.blit(copy, (0, 0))
+    return frame
+
+def check(game, level_size):
+    settings.LEVEL_FILE = common.write_level(*level_size) if level_size else LEVEL_FILE
+    game.init_game_objects()
+    # What is on the display: the whole screen after a flip, only the pushed rects otherwise
+    shown = game.screen.copy()
+    dirty_frames = 0
+    for frame, direction in enumerate(common.random_walk(FRAMES, 1)):
+        game.simulation.step(direction)
+        game.draw_frame()
+        if game.renderer.full:
+            shown.blit(game.screen, (0, 0))
+        else:
+            dirty_frames += 1
+            for rect in game.renderer.rects:
+                shown.blit(game.screen, rect, rect)
+        game.renderer.present(game.screen)
+        if pixels(shown) != full_frame(game):
+            return f"frame {frame}: the display differs from a full redraw", dirty_frames
+    return None, dirty_frames
+
+def main():
+    game = common.create_game()
+    game.show_main_menu = False
+    settings.SHOW_FPS = False
+    failures = 0
+    rows = []
+    for name, size in LEVELS:
+        error, dirty_frames = check(game, size)
+        failures += error is not None
+        rows.append((name, FRAMES, dirty_frames, error or "match"))
+    common.print_table(("level", "frames", "dirty rect frames", "result"), rows)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
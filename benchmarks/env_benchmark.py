@@ -0,0 +1,41 @@
+import time
+import numpy as np
+import pygame
+import common
+from env import PacmanEnv, VectorEnv
+
+STEPS = 2000
+
+def main():
+    rng = np.random.default_rng(0)
+    rows = []
+    for count in (1, 8, 64):
+        env = VectorEnv(count, max_ticks=3600)
+        env.reset()
+        actions = rng.integers(0, 5, size=(STEPS, count))
+        start = time.perf_counter()
+        for step in range(STEPS):
+            env.step(actions[step])
+        elapsed = time.perf_counter() - start
+        rows.append((count, f"{STEPS / elapsed:.0f}", f"{STEPS * count / elapsed:.0f}", f"{elapsed / STEPS / count * 1e6:.1f}"))
+    common.print_table(("envs", "vector steps/s", "env steps/s", "us/env step"), rows)
+
+    # What the incremental observation saves over rebuilding every channel each step
+    env = PacmanEnv()
+    env.reset()
+    for name, update in (("incremental", env.update_actors), ("rebuilt", env.reset_observation)):
+        print(f"{name} observation: {common.time_per_call(update, 2000) * 1e6:.1f} us/step")
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    env = PacmanEnv(render_mode="rgb_array")
+    env.reset()
+
+    def render():
+        env.step(4)
+        pixels = env.render()
+        del pixels
+    print(f"render(): {common.time_per_call(render, 200) * 1e3:.2f} ms/step including the step")
+
+if __name__ == '__main__':
+    main()
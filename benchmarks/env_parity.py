@@ -0,0 +1,81 @@
+import sys
+import common
+import numpy as np
+import pygame
+import settings
+from collision import WALL_TILES
+from env import ACTIONS, CHANNELS, PacmanEnv, PELLETS, POWER_PELLETS, PLAYER, GHOSTS
+from pellets import PELLET, POWER_PELLET
+from swarm import MODES
+
+STEPS = 3000
+SEEDS = [0, 1]
+
+def rasterize(simulation):
+    # Every channel from scratch, the slow way, to compare the incremental observation against
+    level = simulation.level
+    height, width = len(level), len(level[0])
+    size = settings.TILE_SIZE
+    observation = np.zeros((len(CHANNELS), height, width), dtype=np.uint8)
+    observation[0] = [[tile in WALL_TILES for tile in row] for row in level]
+    cells = np.frombuffer(simulation.pellets.cells, dtype=np.uint8).reshape(height, width)
+    observation[PELLETS] = cells == PELLET
+    observation[POWER_PELLETS] = cells == POWER_PELLET
+    x, y = simulation.player_tile()
+    if 0 <= x < width and 0 <= y < height:
+        observation[PLAYER, y, x] = 1
+    simulation.sync_ghosts()
+    for ghost in simulation.ghosts:
+        x, y = ghost.rect.centerx // size, ghost.rect.centery // size
+        if 0 <= x < width and 0 <= y < height:
+            observation[GHOSTS + MODES.index(ghost.mode), y, x] = 1
+    return observation
+
+def pellet_pixels_match(env, pixels):
+    # The pixel at the centre of each tile is the pellet colour exactly where the observation
+    # has a pellet. Walls and the tiles around sprites, which sprites may be drawn over, are skipped
+    size = settings.TILE_SIZE
+    observation = env.observation
+    centres = pixels[size // 2::size, size // 2::size][:env.height, :env.width]
+    drawn = np.all(centres == settings.SCORE_COLOR, axis=2)
+    expected = (observation[PELLETS] | observation[POWER_PELLETS]).astype(bool)
+    covered = observation[0].astype(bool)
+    simulation = env.simulation
+    for rect in [simulation.player.rect] + [ghost.rect for ghost in simulation.ghosts]:
+        x, y = rect.centerx // size, rect.centery // size
+        covered[max(0, y - 1):max(0, y + 2), max(0, x - 1):max(0, x + 2)] = True
+    return np.array_equal(drawn[~covered], expected[~covered])
+
+def check(seed, batched):
+    env = PacmanEnv(seed=seed, max_ticks=2000, batched_ghosts=batched, render_mode="rgb_array")
+    env.reset()
+    episodes = 1
+    for step, direction in enumerate(common.random_walk(STEPS, seed)):
+        _, _, terminated, truncated, _ = env.step(ACTIONS.index(direction))
+        if not np.array_equal(env.observation, rasterize(env.simulation)):
+            return f"step {step}: the observation differs from a full rasterization", episodes
+        pixels = env.render()
+        matches = pellet_pixels_match(env, pixels)
+        del pixels  # The view locks the surface until it is gone
+        if not matches:
+            return f"step {step}: render() shows pellets the observation does not have, or misses some", episodes
+        if terminated or truncated:
+            env.reset(seed + 100 * episodes)
+            episodes += 1
+    return None, episodes
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    failures = 0
+    rows = []
+    for batched in (False, True):
+        for seed in SEEDS:
+            error, episodes = check(seed, batched)
+            failures += error is not None
+            rows.append((batched, seed, STEPS, episodes, error or "match"))
+    common.print_table(("batched", "seed", "steps", "episodes", "result"), rows)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import random
+import time
+import common
+import settings
+from simulation import Simulation
+from sprites.ghosts import Blinky
+
+GHOST_COUNTS = [4, 100, 1000]
+FRAMES = 300
+
+def main():
+    rows = []
+    for count in GHOST_COUNTS:
+        simulation = Simulation()
+        simulation.run(300, lambda simulation: "left")
+        tiles = common.open_tiles(simulation.level)
+        rng = random.Random(count)
+        for x, y in rng.choices(tiles, k=count - len(simulation.ghosts)):
+            simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE, headless=True))
+        player_pos = simulation.player_tile()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            simulation.ghosts.update(simulation.navigation, simulation.collision_grid, simulation.delta_time, player_pos)
+        elapsed = (time.perf_counter() - start) / FRAMES
+        rows.append((count, f"{elapsed * 1e3:.3f}", f"{elapsed / count * 1e6:.2f}"))
+    common.print_table(("ghosts", "ms/frame", "us/ghost"), rows)
+
+if __name__ == '__main__':
+    main()
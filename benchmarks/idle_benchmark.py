@@ -0,0 +1,29 @@
+import time
+import common
+import pygame
+import settings
+
+SECONDS = 3
+
+def measure(game, idle_mode):
+    settings.IDLE_MODE = idle_mode
+    game.running = True
+    pygame.event.clear()
+    pygame.time.set_timer(pygame.QUIT, SECONDS * 1000, 1)
+    wall, cpu = time.perf_counter(), time.process_time()
+    game.run()
+    return (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+def main():
+    game = common.create_game()
+    rows = []
+    for scene in ("main menu", "pause menu"):
+        game.show_main_menu = scene == "main menu"
+        game.paused = scene == "pause menu"
+        for idle_mode in (False, True):
+            usage = measure(game, idle_mode)
+            rows.append((scene, "event wait" if idle_mode else f"tick @ {settings.FPS} fps", f"{usage * 100:.1f}%"))
+    common.print_table(("scene", "loop", "cpu"), rows)
+
+if __name__ == '__main__':
+    main()
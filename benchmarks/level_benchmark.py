@@ -0,0 +1,54 @@
+import common
+import os
+import tempfile
+import time
+import settings
+from level import load_level
+from simulation import Simulation
+from level_compiler import compile_level, load_compiled, wall_shape, NEIGHBOR_OFFSETS
+from collision import WALL_TILES
+
+MAP_SIZES = [(28, 31), (224, 248), (896, 992)]
+
+def legacy_parse(file_path):
+    # What load_level did before the compiler: parse the text, then eight lookups
+    # and the autotile rules for every wall
+    with open(file_path, 'r') as file:
+        level = [list(line.replace("\n", "")) for line in file]
+    height, width = len(level), len(level[0])
+    shapes = []
+    for y, row in enumerate(level):
+        for x, tile in enumerate(row):
+            if tile in WALL_TILES:
+                mask = 0
+                for bit, (dx, dy) in enumerate(NEIGHBOR_OFFSETS):
+                    if 0 <= x + dx < width and 0 <= y + dy < height and level[y + dy][x + dx] in WALL_TILES:
+                        mask |= 1 << bit
+                shapes.append(wall_shape(mask))
+    return shapes
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1e3
+
+def main():
+    settings.LEVEL_CACHE_DIR = tempfile.mkdtemp()
+    directory = tempfile.mkdtemp()
+    rows = []
+    for width, height in MAP_SIZES:
+        file_path = os.path.join(directory, f"level-{width}x{height}.txt")
+        level = common.generate_level(width, height)
+        level[1][1], level[1][2], level[1][3], level[1][5], level[1][6] = 'p', 'B', 'P', 'I', 'C'
+        with open(file_path, 'w') as file:
+            file.write("\n".join("".join(row) for row in level) + "\n")
+        legacy = timed(legacy_parse, file_path)
+        cold = timed(compile_level, file_path)
+        warm = timed(load_compiled, file_path)
+        full = timed(load_level, file_path, settings.TILE_SIZE)
+        startup = timed(Simulation, file_path)
+        rows.append((f"{width}x{height}", f"{legacy:.1f}", f"{cold:.1f}", f"{warm:.2f}", f"{full:.1f}", f"{startup:.1f}"))
+    common.print_table(("map", "legacy parse ms", "compile ms", "cached load ms", "load_level ms", "Simulation ms"), rows)
+
+if __name__ == '__main__':
+    main()
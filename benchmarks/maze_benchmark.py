@@ -0,0 +1,62 @@
+import common
+import numpy as np
+import pygame
+import settings
+from asset_manager import assets
+from level_compiler import WALL_SHAPES
+from simulation import Simulation
+from layers import MazeLayer, PelletLayer, WALL_IMAGE_DIR
+
+FRAMES = 300
+
+def wall_sprites(simulation):
+    # One sprite per wall tile, what load_level built before the maze layer read the planes
+    size = settings.TILE_SIZE
+    images = assets.atlas(WALL_IMAGE_DIR, (size, size))
+    blank = pygame.Surface((size, size), pygame.SRCALPHA)  # Walls without a shape were blitted transparent
+    group = pygame.sprite.Group()
+    for y, x in zip(*np.nonzero(simulation.walls)):
+        shape = simulation.wall_shapes[y, x]
+        sprite = pygame.sprite.Sprite()
+        sprite.image = images[f"{chr(simulation.tiles[y, x])}-{WALL_SHAPES[shape]}"] if shape else blank
+        sprite.rect = pygame.Rect(x * size, y * size, size, size)
+        group.add(sprite)
+    return group
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((settings.GAME_WIDTH, settings.GAME_HEIGHT))
+    simulation = Simulation(headless=False)
+    target = pygame.Surface((settings.GAME_WIDTH, settings.GAME_HEIGHT - 100))
+    walls = wall_sprites(simulation)
+    maze_layer = MazeLayer(simulation.tiles, simulation.wall_shapes, target.get_size())
+    pellet_layer = PelletLayer(simulation.pellets)
+
+    def legacy_frame():
+        # What draw_game_objects did for the static layer before MazeLayer
+        target.fill(settings.BLACK)
+        walls.draw(target)
+        pellet_layer.draw(target)
+
+    def cached_frame():
+        maze_layer.draw(target)
+        pellet_layer.draw(target)
+
+    def rebuild():
+        maze_layer.invalidate()
+        maze_layer.draw(target)
+
+    build_time = common.time_per_call(rebuild, 10)
+    legacy_time = common.time_per_call(legacy_frame, FRAMES)
+    cached_time = common.time_per_call(cached_frame, FRAMES)
+    common.print_table(
+        ("static layer", "blits/frame", "ms/frame"),
+        [
+            ("walls group", len(walls) + 1, f"{legacy_time * 1e3:.3f}"),
+            ("maze layer", len(list(maze_layer.visible_chunks(target.get_rect()))) + 1, f"{cached_time * 1e3:.3f}"),
+        ]
+    )
+    print(f"maze layer rebuild: {build_time * 1e3:.3f} ms ({len(walls)} walls)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+import time
+import common
+import settings
+
+FRAMES = 300
+
+def cpu_per_frame(function):
+    start = time.process_time()
+    for _ in range(FRAMES):
+        function()
+    return (time.process_time() - start) / FRAMES
+
+def main():
+    game = common.create_game()
+    rows = []
+    for name, menu in (("main menu", game.main_menu), ("pause menu", game.pause_menu)):
+
+        def immediate():
+            # Every idle frame recomposed straight onto the screen, as BaseMenu.draw did before the frame cache
+            menu.compose(game.screen)
+
+        composed = cpu_per_frame(immediate)
+        cached = cpu_per_frame(menu.draw)
+        for mode, cost in (("recompose", composed), ("cached", cached)):
+            rows.append((name, mode, f"{cost * 1e3:.3f}", f"{cost * settings.FPS * 100:.1f}%"))
+    common.print_table(("menu", "mode", "cpu ms/frame", f"cpu @ {settings.FPS} fps"), rows)
+
+if __name__ == '__main__':
+    main()
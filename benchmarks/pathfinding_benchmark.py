@@ -0,0 +1,52 @@
+import random
+import time
+import common
+import settings
+from collision import CollisionGrid
+from navigation import NavigationGraph
+from pathfinding import DistanceField
+from simulation import Simulation
+from sprites.ghosts import Blinky
+
+MAP_SIZES = [(56, 62), (112, 124), (224, 248)]
+GHOST_COUNTS = [4, 40]
+FRAMES = 300
+
+def chase_frame_cost(level, ghost_count):
+    # Ghosts chasing a player that walks across a new tile every 8 frames
+    navigation = NavigationGraph(common.wall_plane(level))
+    field = DistanceField(navigation)
+    tiles = common.open_tiles(level)
+    rng = random.Random(ghost_count)
+    ghosts = [Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE, headless=True) for x, y in rng.choices(tiles, k=ghost_count)]
+    for ghost in ghosts:
+        ghost.mode = "chase"
+    grid = CollisionGrid(common.wall_plane(level))
+    path = rng.choices(tiles, k=FRAMES // 8 + 1)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        player_tile = path[frame // 8]
+        distances = field.distances_to(player_tile)
+        for ghost in ghosts:
+            ghost.update(navigation, grid, 1 / settings.TICK_RATE, player_tile, distances)
+    return (time.perf_counter() - start) / FRAMES, field.searches
+
+def main():
+    simulation = Simulation()
+    field = DistanceField(simulation.navigation)
+    start = time.perf_counter()
+    field.precompute()
+    print(f"level-1: {len(field.walkable)} walkable tiles, all-pairs precompute {(time.perf_counter() - start) * 1e3:.1f} ms, {field.all_pairs_bytes() / 1024:.0f} KiB")
+
+    rows = []
+    for width, height in MAP_SIZES:
+        level = common.generate_level(width, height)
+        field = DistanceField(NavigationGraph(common.wall_plane(level)))
+        search_time = common.time_per_call(lambda: field.search(field.walkable[0]), 3)
+        for count in GHOST_COUNTS:
+            frame_time, searches = chase_frame_cost(level, count)
+            rows.append((f"{width}x{height}", len(field.walkable), f"{search_time * 1e3:.2f}", count, searches, f"{frame_time * 1e3:.3f}", f"{frame_time / count * 1e6:.2f}"))
+    common.print_table(("map", "walkable", "bfs ms", "ghosts", "searches", "ms/frame", "us/ghost"), rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+import time
+import common
+from profiler import profiler
+from simulation import Simulation
+
+TICKS = 3600
+
+def null_phase():
+    with profiler.phase("bench"):
+        pass
+
+def run_ticks():
+    simulation = Simulation()
+    start = time.perf_counter()
+    simulation.run(TICKS, lambda simulation: "left")
+    return (time.perf_counter() - start) / TICKS
+
+def main():
+    rows = []
+    for enabled in (False, True):
+        profiler.enabled = enabled
+        profiler.reset()
+        phase_cost = common.time_per_call(null_phase, 100000)
+        tick_cost = min(run_ticks() for _ in range(3))
+        rows.append(("on" if enabled else "off", f"{phase_cost * 1e9:.0f}", f"{tick_cost * 1e6:.1f}"))
+    profiler.enabled = False
+    common.print_table(("profiler", "ns per phase", "us per simulation tick"), rows)
+
+if __name__ == '__main__':
+    main()
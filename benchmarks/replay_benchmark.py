@@ -0,0 +1,37 @@
+import os
+import random
+import tempfile
+import time
+import common
+from simulation import Simulation
+from replay import InputRecorder, Replay
+
+MINUTES = 10
+
+def main():
+    ticks = MINUTES * 60 * 60
+    rng = random.Random(0)
+    direction = "left"
+    simulation = Simulation()
+    simulation.recorder = InputRecorder(simulation)
+    for _ in range(ticks):
+        if rng.random() < 0.03:
+            direction = rng.choice(["left", "right", "up", "down"])
+        simulation.step(direction)
+    path = os.path.join(tempfile.mkdtemp(), "run.pacrec")
+    simulation.recorder.save(path)
+
+    start = time.perf_counter()
+    replay = Replay.load(path)
+    load_time = time.perf_counter() - start
+    playback = replay.simulation()
+    start = time.perf_counter()
+    matches = replay.run(playback)
+    run_time = time.perf_counter() - start
+    common.print_table(
+        ("ticks", "log bytes", "bytes/min", "load ms", "fast-forward s", "ticks/s", "x real time", "matches"),
+        [(ticks, os.path.getsize(path), os.path.getsize(path) // MINUTES, f"{load_time * 1e3:.2f}", f"{run_time:.2f}", f"{ticks / run_time:.0f}", f"{ticks / run_time / 60:.0f}", matches)]
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import common
+import settings
+from replay import InputRecorder, Replay, CHASE_METRICS
+
+TICKS = 3000
+SEED = 7
+
+def record(path, batched):
+    simulation = common.create_simulation(seed=SEED, batched_ghosts=batched)
+    simulation.recorder = InputRecorder(simulation)
+    for direction in common.random_walk(TICKS, SEED, ["left", "right", "up", "down", None]):
+        simulation.step(direction)
+    simulation.recorder.save(path)
+
+def rejected(replay, batched):
+    try:
+        replay.simulation(batched_ghosts=batched)
+    except ValueError as e:
+        return str(e)
+    return None
+
+def main():
+    failures = 0
+    chase_metric = settings.GHOST_CHASE_METRIC
+    directory = tempfile.mkdtemp()
+    rows = []
+    for metric in CHASE_METRICS:
+        for batched in (False, True):
+            settings.GHOST_CHASE_METRIC = metric
+            path = os.path.join(directory, f"{metric}-{batched}.pacrec")
+            record(path, batched)
+            replay = Replay.load(path)
+            matches = replay.run(replay.simulation(batched_ghosts=batched))
+            # Playing back under any other setting has to be refused up front, not end in a checksum miss
+            other_batching = rejected(replay, not batched)
+            settings.GHOST_CHASE_METRIC = next(other for other in CHASE_METRICS if other != metric)
+            other_metric = rejected(replay, batched)
+            failures += not matches or other_batching is None or other_metric is None
+            rows.append((metric, batched, os.path.getsize(path), matches, other_batching is not None, other_metric is not None))
+    settings.GHOST_CHASE_METRIC = chase_metric
+    common.print_table(("metric", "batched", "bytes", "checksum matches", "rejects batching", "rejects metric"), rows)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
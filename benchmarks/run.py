@@ -0,0 +1,210 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+import common
+import numpy
+import pygame
+import settings
+from profiler import profiler
+
+BASELINE = os.path.join(common.ROOT, "benchmarks", "baseline.json")
+THRESHOLD = 0.35  # Relative slowdown against the baseline that fails the run
+WARMUP_FRAMES = 10
+ALLOCATION_FRAMES = 60
+# Metric -> absolute difference that is never a regression, whatever the ratio
+NOISE_FLOORS = {"update": 0.05, "draw": 0.05, "present": 0.05, "load": 5.0, "compile": 1.0, "startup": 5.0, "blits_per_frame": 0.5, "alloc_peak_kb": 64}
+
+@contextmanager
+def overrides(**values):
+    # Scenario-specific settings, restored so later scenarios start from the defaults
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+def gameplay(game, frames):
+    directions = common.random_walk(frames)
+
+    def frame(index):
+        with profiler.phase("update"):
+            game.simulation.step(directions[index])
+        with profiler.phase("draw"):
+            game.draw_frame()
+        with profiler.phase("present"):
+            game.renderer.present(game.screen)
+    return frame
+
+def main_menu_idle(frames):
+    game = common.create_game()
+    # What one wake-up of the idle loop costs: no events, the cached menu frame, a flip
+    return lambda index: game.run_frame([])
+
+def pause_overlay(frames):
+    game = common.create_game()
+    game.show_main_menu = False
+    game.simulation.run(120, lambda simulation: "left")
+    game.events([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)])
+    return lambda index: game.run_frame([])
+
+def standard_level(frames):
+    game = common.create_game()
+    game.show_main_menu = False
+    return gameplay(game, frames)
+
+def ghost_swarm(frames):
+    from sprites.ghosts import Blinky
+    with overrides(BATCHED_GHOSTS=True):
+        game = common.create_game()
+    game.show_main_menu = False
+    rng = random.Random(500)
+    for x, y in rng.choices(common.open_tiles(game.simulation.level), k=500 - len(game.simulation.ghosts)):
+        game.simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE))
+    return gameplay(game, frames)
+
+def large_maze(frames):
+    with overrides(LEVEL_FILE=common.write_level(224, 248), LEVEL_CACHE_DIR=tempfile.mkdtemp()):
+        game = common.create_game()
+    game.show_main_menu = False
+    return gameplay(game, frames)
+
+def level_loading(frames):
+    from level import load_level
+    from level_compiler import compile_level
+    from simulation import Simulation
+    file_path = common.write_level(224, 248)
+    cache_directory = tempfile.mkdtemp()
+
+    def frame(index):
+        # The previous frame's simulation is garbage by now; collect it here rather than inside the timing
+        gc.collect()
+        with overrides(LEVEL_CACHE_DIR=cache_directory):
+            with profiler.phase("compile"):
+                compile_level(file_path)
+            with profiler.phase("load"):
+                load_level(file_path, settings.TILE_SIZE)
+            # Everything a new game pays before its first tick: collisions, pellets, navigation
+            with profiler.phase("startup"):
+                Simulation(file_path)
+    return frame
+
+# name -> (setup, measured frames); setup returns frame(index)
+SCENARIOS = {
+    "main_menu_idle": (main_menu_idle, 300),
+    "pause_overlay": (pause_overlay, 300),
+    "standard_level": (standard_level, 1200),
+    "ghost_swarm_500": (ghost_swarm, 300),
+    "large_maze": (large_maze, 600),
+    "level_loading": (level_loading, 20),
+}
+
+def run_scenario(setup, frames):
+    total = WARMUP_FRAMES + frames + ALLOCATION_FRAMES
+    frame = setup(total)
+    for index in range(WARMUP_FRAMES):
+        frame(index)
+
+    profiler.history = frames
+    profiler.enabled = True
+    profiler.reset()
+    for index in range(WARMUP_FRAMES, WARMUP_FRAMES + frames):
+        with profiler.phase("frame"):
+            frame(index)
+    phases = profiler.summary()
+    for name, samples in profiler.samples.items():
+        phases[name]["mean"] = sum(samples) / len(samples)
+    counters = profiler.take_counters()
+    profiler.enabled = False
+
+    # Separate pass: tracemalloc slows everything down too much to time under it
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for index in range(WARMUP_FRAMES + frames, total):
+        frame(index)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "frames": frames,
+        "phases": {name: {key: round(value, 4) for key, value in stats.items()} for name, stats in phases.items()},
+        "blits_per_frame": counters.get("blits", 0) / frames,
+        "alloc_peak_kb": round((peak - start) / 1024, 1),
+        "alloc_retained_kb_per_frame": round((current - start) / 1024 / ALLOCATION_FRAMES, 3),
+    }
+
+def compared_metrics(result):
+    # p50 of every top-level phase plus the counters; sub-phases are reported but too noisy to gate on
+    metrics = {name: stats["p50"] for name, stats in result["phases"].items() if name in NOISE_FLOORS}
+    metrics["blits_per_frame"] = result["blits_per_frame"]
+    metrics["alloc_peak_kb"] = result["alloc_peak_kb"]
+    return metrics
+
+def compare(results, baseline, threshold):
+    failures = []
+    for name, result in results["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        expected = compared_metrics(reference)
+        for metric, value in compared_metrics(result).items():
+            if metric not in expected:
+                continue
+            if value > expected[metric] * (1 + threshold) and value - expected[metric] > NOISE_FLOORS[metric]:
+                failures.append(f"{name}: {metric} {expected[metric]:.3f} -> {value:.3f}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scripted benchmark scenarios and compare them against a baseline.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only this scenario (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    arguments = parser.parse_args()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(), "pygame": pygame.version.ver,
+            "numpy": numpy.__version__, "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    for name in arguments.scenario or SCENARIOS:
+        setup, frames = SCENARIOS[name]
+        print(f"running {name}", file=sys.stderr)
+        results["scenarios"][name] = run_scenario(setup, frames)
+
+    report = json.dumps(results, indent=2)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, 'w') as file:
+            file.write(report + "\n")
+        print(f"baseline written to {arguments.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(arguments.baseline):
+        print("no baseline to compare against; run with --update-baseline", file=sys.stderr)
+        return 0
+    with open(arguments.baseline) as file:
+        failures = compare(results, json.load(file), arguments.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    if not failures:
+        print("no regressions", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
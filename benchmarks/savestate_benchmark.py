@@ -0,0 +1,56 @@
+import random
+import common
+import settings
+from savestate import RewindBuffer, save_state, load_state
+from simulation import Simulation
+from sprites.ghosts import Blinky
+
+TICKS = 6000
+
+def played(ghosts=0):
+    simulation = Simulation(batched_ghosts=ghosts > 0, seed=1)
+    rng = random.Random(ghosts)
+    for x, y in rng.choices(common.open_tiles(simulation.level), k=ghosts):
+        simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE))
+    simulation.run(600, lambda simulation: "left")
+    return simulation
+
+def main():
+    rows = []
+    for ghosts in (0, 500):
+        simulation = played(ghosts)
+        state = save_state(simulation)
+        save_time = common.time_per_call(lambda: save_state(simulation), 5000)
+        load_time = common.time_per_call(lambda: load_state(simulation, state), 5000)
+        tick_time = common.time_per_call(simulation.step, 500)
+        rows.append((len(simulation.ghosts), len(state), f"{save_time * 1e6:.1f}", f"{load_time * 1e6:.1f}", f"{1 / load_time:.0f}", f"{tick_time * 1e6:.1f}"))
+    common.print_table(("ghosts", "state bytes", "save us", "restore us", "restores/s", "tick us"), rows)
+
+    # Rewind on level-1: one state per tick of a seeded run
+    simulation = Simulation(seed=1)
+    rng = random.Random(0)
+    direction = "left"
+    states = []
+    for _ in range(TICKS):
+        if rng.random() < 0.03:
+            direction = rng.choice(["left", "right", "up", "down"])
+        simulation.step(direction)
+        states.append(save_state(simulation))
+    rows = []
+    for interval in (30, 60, 120):
+        rewind = RewindBuffer(settings.REWIND_MEMORY, interval)
+        push_time = common.time_per_call(lambda: [rewind.push(state) for state in states], 1, repeat=1) / TICKS
+        latest_time = common.time_per_call(rewind.latest, 5000)
+        pop_time = common.time_per_call(lambda: [rewind.pop() for _ in range(TICKS)], 1, repeat=1) / TICKS
+        bytes_per_tick = sum(len(state) for state in states) / TICKS
+        for state in states:
+            rewind.push(state)
+        minutes = settings.REWIND_MEMORY / (rewind.size / len(rewind)) / settings.TICK_RATE / 60
+        rows.append((
+            interval, f"{bytes_per_tick:.0f}", f"{rewind.size / len(rewind):.1f}",
+            f"{push_time * 1e6:.1f}", f"{latest_time * 1e6:.1f}", f"{pop_time * 1e6:.1f}", f"{minutes:.0f}",
+        ))
+    common.print_table(("keyframe every", "raw B/tick", "stored B/tick", "push us", "latest us", "pop us", f"minutes in {settings.REWIND_MEMORY >> 20} MB"), rows)
+
+if __name__ == '__main__':
+    main()
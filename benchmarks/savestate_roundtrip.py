@@ -0,0 +1,106 @@
+import random
+import sys
+import common
+from replay import state_checksum
+from savestate import RewindBuffer, save_state, load_state
+
+TICKS = 3000
+CHECKPOINT_EVERY = 250
+FOLLOW_TICKS = 120
+EXTRA_GHOSTS = 20
+REWIND_BUDGET = 4000  # Small enough that whole groups get evicted many times over
+REWIND_KEYFRAME_INTERVAL = 7
+
+def create_simulation(batched, ghosts=EXTRA_GHOSTS):
+    return common.create_simulation(ghosts, 3, batched_ghosts=batched)
+
+def check_restore(batched):
+    # Every CHECKPOINT_EVERY ticks the running game is saved and loaded into a fresh simulation
+    # that has been played elsewhere first; both then take the same input for FOLLOW_TICKS and
+    # have to stay identical on every tick
+    rng = random.Random(batched)
+    original = create_simulation(batched)
+    restored = None
+    following = 0
+    checks = 0
+    for tick, direction in enumerate(common.random_walk(TICKS, 5)):
+        if tick % CHECKPOINT_EVERY == 0:
+            state = save_state(original)
+            restored = create_simulation(batched)
+            restored.run(rng.randrange(1, 200), lambda simulation: rng.choice(["left", "right", "up", "down"]))
+            load_state(restored, state)
+            if save_state(restored) != state:
+                return f"tick {tick}: the loaded state saves back differently", checks
+            following = FOLLOW_TICKS
+        original.step(direction)
+        if following:
+            restored.step(direction)
+            following -= 1
+            checks += 1
+            if save_state(restored) != save_state(original) or state_checksum(restored) != state_checksum(original):
+                return f"tick {tick + 1}: the restored game diverged {FOLLOW_TICKS - following} ticks after loading", checks
+    return None, checks
+
+def stored_size(rewind):
+    return sum(len(keyframe) + len(deltas) + len(ends) * ends.itemsize for keyframe, deltas, ends in rewind.groups)
+
+def check_rewind_buffer():
+    # Push a game's states, popping random stretches back off along the way, and check every
+    # decoded state against the plain list of what should still be held
+    simulation = create_simulation(False)
+    states = []
+    for direction in common.random_walk(TICKS, 6):
+        simulation.step(direction)
+        states.append(save_state(simulation))
+    # A state of another length (more ghosts) part way through has to start a new group
+    other = create_simulation(False, EXTRA_GHOSTS + 1)
+    other.run(100, lambda simulation: "left")
+    states[TICKS // 2] = save_state(other)
+
+    rng = random.Random(7)
+    rewind = RewindBuffer(REWIND_BUDGET, REWIND_KEYFRAME_INTERVAL)
+    expected = []
+    evictions = pops = 0
+    for index, state in enumerate(states):
+        rewind.push(state)
+        expected.append(state)
+        if len(rewind) < len(expected):
+            evictions += 1
+            del expected[:len(expected) - len(rewind)]
+        if rewind.latest() != state:
+            return f"push {index}: latest() decodes to another state", evictions, pops
+        if rewind.size != stored_size(rewind) or len(rewind) != sum(1 + len(ends) for _, _, ends in rewind.groups):
+            return f"push {index}: size or count accounting is off", evictions, pops
+        if rewind.size > REWIND_BUDGET and len(rewind.groups) > 1:
+            return f"push {index}: over budget with more than one group held", evictions, pops
+        if rng.random() < 0.02:
+            for _ in range(rng.randrange(1, len(rewind))):
+                pops += 1
+                if rewind.pop() != expected.pop():
+                    return f"push {index}: pop() returned the wrong state", evictions, pops
+                if rewind.size != stored_size(rewind):
+                    return f"push {index}: size accounting is off after pop()", evictions, pops
+    while expected:
+        pops += 1
+        if rewind.pop() != expected.pop():
+            return "draining: pop() returned the wrong state", evictions, pops
+    if len(rewind) or rewind.size or rewind.groups:
+        return "draining: the buffer is not empty", evictions, pops
+    return None, evictions, pops
+
+def main():
+    failures = 0
+    rows = []
+    for batched in (False, True):
+        error, checks = check_restore(batched)
+        failures += error is not None
+        rows.append((batched, TICKS // CHECKPOINT_EVERY, checks, error or "match"))
+    common.print_table(("batched", "checkpoints", "ticks compared", "result"), rows)
+
+    error, evictions, pops = check_rewind_buffer()
+    failures += error is not None
+    common.print_table(("pushes", "evicting pushes", "pops", "result"), [(TICKS, evictions, pops, error or "match")])
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
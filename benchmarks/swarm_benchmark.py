@@ -0,0 +1,34 @@
+import random
+import time
+import common
+import settings
+from simulation import Simulation
+from sprites.ghosts import Blinky
+from swarm import GhostSwarm
+
+GHOST_COUNTS = [4, 50, 500, 5000]
+
+def frame_time(simulation, update, frames):
+    player_pos = simulation.player_tile()
+    start = time.perf_counter()
+    for _ in range(frames):
+        update(player_pos)
+    return (time.perf_counter() - start) / frames
+
+def main():
+    rows = []
+    for count in GHOST_COUNTS:
+        simulation = Simulation()
+        tiles = common.open_tiles(simulation.level)
+        rng = random.Random(count)
+        for x, y in rng.choices(tiles, k=count - len(simulation.ghosts)):
+            simulation.add_ghost(Blinky(x * settings.TILE_SIZE, y * settings.TILE_SIZE, headless=True))
+        swarm = GhostSwarm.from_ghosts(simulation.ghosts, simulation.navigation, simulation.collision_grid)
+        frames = max(10, 20000 // count)
+        sprites = frame_time(simulation, lambda player_pos: simulation.ghosts.update(simulation.navigation, simulation.collision_grid, simulation.delta_time, player_pos), frames)
+        batched = frame_time(simulation, lambda player_pos: swarm.update(simulation.delta_time, player_pos), frames)
+        rows.append((count, f"{sprites * 1e3:.3f}", f"{batched * 1e3:.3f}", f"{sprites / batched:.1f}x"))
+    common.print_table(("ghosts", "sprites ms/frame", "swarm ms/frame", "speedup"), rows)
+
+if __name__ == '__main__':
+    main()
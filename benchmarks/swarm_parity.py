@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import common
+import settings
+from modes import FRIGHTENED
+
+TICKS = 4000
+SEEDS = [0, 1, 2]
+METRICS = ["euclidean", "maze"]
+EXTRA_GHOSTS = 20
+
+def ghostless_level():
+    # level-1 with its ghost spawns turned into floor: the swarm has to cope with no ghosts at all
+    with open(settings.LEVEL_FILE) as file:
+        text = file.read()
+    file_path = os.path.join(tempfile.mkdtemp(), "no-ghosts.txt")
+    with open(file_path, 'w') as file:
+        file.write(text.translate(str.maketrans("BPIC", "    ")))
+    return file_path
+
+def ghost_state(simulation):
+    simulation.sync_ghosts()
+    return [(ghost.rect.topleft, ghost.direction, ghost.mode) for ghost in simulation.ghosts]
+
+def compare(seed, level_file=None, extra_ghosts=EXTRA_GHOSTS):
+    # Same seed and input through the sprite path and the GhostSwarm: every tick must match
+    sprites = common.create_simulation(extra_ghosts, seed, level_file, batched_ghosts=False)
+    swarm = common.create_simulation(extra_ghosts, seed, level_file, batched_ghosts=True)
+    frightened = 0
+    for tick, direction in enumerate(common.random_walk(TICKS, seed)):
+        sprites.step(direction)
+        swarm.step(direction)
+        if sprites.player.rect != swarm.player.rect:
+            return f"tick {tick}: the player is at {swarm.player.rect}, the sprite path has {sprites.player.rect}", frightened
+        expected, actual = ghost_state(sprites), ghost_state(swarm)
+        if expected != actual:
+            ghost = next(index for index, (a, b) in enumerate(zip(expected, actual)) if a != b)
+            return f"tick {tick}: ghost {ghost} is {actual[ghost]}, the sprite path has {expected[ghost]}", frightened
+        frightened += sprites.mode_scheduler.mode == FRIGHTENED
+    return None, frightened
+
+def main():
+    failures = 0
+    chase_metric = settings.GHOST_CHASE_METRIC
+    rows = []
+    for metric in METRICS:
+        settings.GHOST_CHASE_METRIC = metric
+        for seed in SEEDS:
+            error, frightened = compare(seed)
+            failures += error is not None
+            rows.append((metric, seed, TICKS, frightened, error or "match"))
+        error, frightened = compare(0, ghostless_level(), 0)
+        failures += error is not None
+        rows.append((metric, "no ghosts", TICKS, frightened, error or "match"))
+    settings.GHOST_CHASE_METRIC = chase_metric
+    common.print_table(("metric", "seed", "ticks", "frightened ticks", "result"), rows)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import common
+from text_cache import text_cache
+
+FRAMES = 120
+
+def measure(name, draw, rows):
+    draw()  # Warm the cache
+    hits, misses = text_cache.hits, text_cache.misses
+    for _ in range(FRAMES):
+        draw()
+    calls = text_cache.hits - hits + text_cache.misses - misses
+    rows.append((name, f"{calls / FRAMES:.1f}", f"{(text_cache.misses - misses) / FRAMES:.2f}"))
+
+def main():
+    game = common.create_game()
+    rows = []
+    measure("main menu", game.main_menu.draw, rows)
+    game.show_main_menu = False
+
+    def play():
+        game.simulation.step("left")
+        game.draw()
+
+    measure("gameplay", play, rows)
+    game.paused = True
+    measure("pause menu", game.draw, rows)
+    common.print_table(("scene", "text renders/frame", "rasterizations/frame"), rows)
+    print(text_cache.stats())
+
+if __name__ == '__main__':
+    main()
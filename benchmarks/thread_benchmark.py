@@ -0,0 +1,74 @@
+import statistics
+import time
+import common
+import settings
+
+FRAMES = 600
+SLOW_FRAME_EVERY = 20  # Every so often a frame stalls, like a resize calling set_mode or a menu re-render
+SLOW_FRAME_TIME = 0.05
+INPUT_EVERY = 15
+DIRECTIONS = ["left", "up", "right", "down"]
+
+def percentiles(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] * 1e3, ordered[int(len(ordered) * 0.99)] * 1e3, ordered[-1] * 1e3
+
+def measure(threaded):
+    settings.THREADED_SIMULATION = threaded
+    game = common.create_game()
+    game.show_main_menu = False
+    live = game.live_simulation()
+    tick_times = []
+    step = live.step
+
+    def timed_step(direction=None):
+        step(direction)
+        tick_times.append(time.perf_counter())
+    live.step = timed_step
+
+    draw_frame = game.draw_frame
+
+    def draw_with_stalls():
+        draw_frame()
+        if frame % SLOW_FRAME_EVERY == SLOW_FRAME_EVERY - 1:
+            time.sleep(SLOW_FRAME_TIME)
+    game.draw_frame = draw_with_stalls
+
+    frame_times, latencies = [], []
+    pending = None  # (time the input was handed in, tick it has to be applied after)
+    for frame in range(FRAMES):
+        if frame % INPUT_EVERY == 0 and pending is None:
+            game.simulation.player.desired_direction = DIRECTIONS[frame // INPUT_EVERY % len(DIRECTIONS)]
+            pending = (time.perf_counter(), len(tick_times))
+        game.run_frame()
+        presented = time.perf_counter()
+        frame_times.append(presented)
+        if pending:
+            # Shown once a frame on screen includes a tick that used the input
+            shown = game.simulation_thread.shown.input_time >= pending[0] if threaded else len(tick_times) > pending[1]
+            if shown:
+                latencies.append(presented - pending[0])
+                pending = None
+    if game.simulation_thread:
+        game.simulation_thread.stop()
+
+    frame_intervals = [later - earlier for earlier, later in zip(frame_times, frame_times[1:])]
+    tick_intervals = [later - earlier for earlier, later in zip(tick_times, tick_times[1:])]
+    return [
+        "threaded" if threaded else "serial",
+        *(f"{value:.1f}" for value in percentiles(frame_intervals)),
+        *(f"{value:.1f}" for value in percentiles(tick_intervals)),
+        f"{statistics.pstdev(tick_intervals) * 1e3:.2f}",
+        *(f"{value:.1f}" for value in percentiles(latencies)),
+    ]
+
+def main():
+    rows = [measure(False), measure(True)]
+    common.print_table(
+        ("mode", "frame p50", "frame p99", "frame max", "tick p50", "tick p99", "tick max", "tick stdev", "latency p50", "latency p99", "latency max"),
+        rows
+    )
+    print(f"ms; {FRAMES} frames at {settings.FPS} FPS, a {SLOW_FRAME_TIME * 1e3:.0f} ms stall every {SLOW_FRAME_EVERY} frames")
+
+if __name__ == '__main__':
+    main()
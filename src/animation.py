@@ -0,0 +1,32 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+# Times built from tick counts can land a hair short of a frame boundary (0.3 is just under 0.1 * 3)
+EPSILON = 1e-6
+
+class Animation:
+    # A frame schedule computed once and shared by every sprite that plays it: frame i is shown
+    # for durations[i] seconds. Sprites keep no per-frame state, they ask frame_at(elapsed time)
+    # when drawn, so nothing is updated while nothing is rendered
+    def __init__(self, durations, loop=True):
+        self.ends = list(accumulate(durations))
+        self.duration = self.ends[-1]
+        self.loop = loop
+
+    @classmethod
+    def uniform(cls, frame_count, frame_time, loop=True):
+        return cls([frame_time] * frame_count, loop)
+
+    def __len__(self):
+        return len(self.ends)
+
+    def frame_at(self, time):
+        time += EPSILON
+        if self.loop:
+            time %= self.duration
+        elif time >= self.duration:
+            return len(self.ends) - 1
+        return bisect_right(self.ends, time)
+
+STILL = Animation([1])  # Single-image sprites, so they can be drawn the same way as animated ones
+PLAYER_CHOMP = Animation.uniform(3, 0.1)  # Mouth open, half, closed at 10 frames per second
@@ -0,0 +1,88 @@
+import os
+import pygame
+
+class AssetManager:
+    def __init__(self):
+        self.sources = {}   # path -> decoded (and display-converted) image
+        self.surfaces = {}  # (path, size, flip, angle) -> transformed image
+        self.atlases = {}   # (directory, size) -> (atlas surface, {name: region})
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path):
+        source = self.sources.get(path)
+        if source is None:
+            source = pygame.image.load(path)
+            if pygame.display.get_surface():
+                source = source.convert_alpha()
+            self.sources[path] = source
+        return source
+
+    def image(self, path, size=None, flip=(False, False), angle=0):
+        key = (path, size, flip, angle)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.load(path)
+        if size and surface.get_size() != tuple(size):
+            surface = pygame.transform.scale(surface, size)
+        if any(flip):
+            surface = pygame.transform.flip(surface, *flip)
+        if angle:
+            surface = pygame.transform.rotate(surface, angle)
+        self.surfaces[key] = surface
+        return surface
+
+    def variants(self, paths, size, angles):
+        # Frames x headings table built up front: {heading: [frame surface, ...]}
+        return {heading: [self.image(path, size, angle=angle) for path in paths] for heading, angle in angles.items()}
+
+    def atlas(self, directory, size):
+        # Every PNG in directory packed into one surface; regions are subsurfaces keyed by file stem
+        key = (directory, size)
+        atlas = self.atlases.get(key)
+        if atlas is not None:
+            self.hits += 1
+            return atlas[1]
+        self.misses += 1
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".png"))
+        width, height = size
+        surface = pygame.Surface((width * len(names), height), pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        regions = {}
+        for i, name in enumerate(names):
+            image = self.load(os.path.join(directory, name))
+            if image.get_size() != (width, height):
+                image = pygame.transform.scale(image, size)
+            surface.blit(image, (i * width, 0))
+            regions[os.path.splitext(name)[0]] = surface.subsurface((i * width, 0, width, height))
+        self.atlases[key] = (surface, regions)
+        return regions
+
+    def evict(self, path=None):
+        # Drop one image (with all of its variants and atlases), or everything when path is None
+        if path is None:
+            self.sources.clear()
+            self.surfaces.clear()
+            self.atlases.clear()
+            return
+        self.sources.pop(path, None)
+        for key in [key for key in self.surfaces if key[0] == path]:
+            del self.surfaces[key]
+        directory = os.path.dirname(path)
+        for key in [key for key in self.atlases if key[0] == directory]:
+            del self.atlases[key]
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sources": len(self.sources),
+            "surfaces": len(self.surfaces),
+            "atlases": len(self.atlases),
+        }
+
+assets = AssetManager()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from collections import Counter
+import settings
+from level_compiler import load_compiled
+from policies import POLICIES, create_policy
+from simulation import Simulation
+
+simulations = {}  # level file -> loaded Simulation, one set per worker process
+
+def init_worker(level_files):
+    # Paid once per worker: imports, level parsing, navigation and distance tables
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Ctrl+C is handled by the parent, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for level_file in level_files:
+        simulation_for(level_file)
+
+def simulation_for(level_file):
+    simulation = simulations.get(level_file)
+    if simulation is None:
+        simulation = simulations[level_file] = Simulation(level_file)
+        simulation.end_on_death = True
+    return simulation
+
+def run_game(job):
+    simulation = simulation_for(job["level"])
+    simulation.reset(job["seed"])
+    policy = create_policy(job["policy"], job["seed"])
+    pellets = simulation.pellets
+    while simulation.tick < job["ticks"] and not simulation.dead and pellets.remaining:
+        simulation.step(policy(simulation))
+    return {
+        **job,
+        "score": simulation.player.score,
+        "pellets_eaten": pellets.total - pellets.remaining,
+        "ticks_survived": simulation.tick,
+        "died": simulation.dead,
+        "death_tile": simulation.death_tile,
+        "cleared": pellets.remaining == 0,
+    }
+
+def create_jobs(level_files, policies, games, ticks, first_seed=0):
+    return [
+        {"level": level_file, "policy": policy, "seed": seed, "ticks": ticks}
+        for level_file in level_files for policy in policies for seed in range(first_seed, first_seed + games)
+    ]
+
+def run_batch(jobs, workers=None, chunksize=None):
+    # Yields results as games finish, in completion order
+    level_files = sorted({job["level"] for job in jobs})
+    for level_file in level_files:
+        # Compile the level caches up front so workers never race to write them
+        load_compiled(level_file)
+    if workers == 0:
+        init_worker(level_files)
+        for job in jobs:
+            yield run_game(job)
+        return
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(jobs) // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(level_files,)) as pool:
+        yield from pool.imap_unordered(run_game, jobs, chunksize)
+
+class Report:
+    def __init__(self):
+        self.groups = {}  # (level, policy) -> running totals
+
+    def add(self, result):
+        group = self.groups.get((result["level"], result["policy"]))
+        if group is None:
+            group = self.groups[(result["level"], result["policy"])] = {
+                "games": 0, "score": 0, "pellets_eaten": 0, "ticks_survived": 0,
+                "deaths": 0, "clears": 0, "best_score": 0, "death_tiles": Counter(),
+            }
+        group["games"] += 1
+        group["score"] += result["score"]
+        group["pellets_eaten"] += result["pellets_eaten"]
+        group["ticks_survived"] += result["ticks_survived"]
+        group["deaths"] += result["died"]
+        group["clears"] += result["cleared"]
+        group["best_score"] = max(group["best_score"], result["score"])
+        if result["death_tile"]:
+            group["death_tiles"][tuple(result["death_tile"])] += 1
+
+    def summary(self, top_tiles=5):
+        return [
+            {
+                "level": level, "policy": policy, "games": group["games"],
+                "mean_score": round(group["score"] / group["games"], 2),
+                "best_score": group["best_score"],
+                "mean_pellets_eaten": round(group["pellets_eaten"] / group["games"], 2),
+                "mean_ticks_survived": round(group["ticks_survived"] / group["games"], 1),
+                "death_rate": round(group["deaths"] / group["games"], 3),
+                "clear_rate": round(group["clears"] / group["games"], 3),
+                "death_tiles": {f"{x},{y}": count for (x, y), count in group["death_tiles"].most_common(top_tiles)},
+            }
+            for (level, policy), group in sorted(self.groups.items())
+        ]
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Play many headless games across a process pool and report the results.")
+    parser.add_argument("--level", action="append", help="level file to play (repeatable, default settings.LEVEL_FILE)")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES), help="input policy (repeatable, default random)")
+    parser.add_argument("--games", type=int, default=100, help="games per level and policy, seeded from --seed upwards")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=settings.TICK_RATE * 120, help="tick limit per game")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU, 0 to run in this process)")
+    parser.add_argument("--results", metavar="PATH", help="stream every game's result to this file as JSON lines")
+    parser.add_argument("--output", metavar="PATH", help="write the aggregated report here instead of stdout")
+    return parser.parse_args()
+
+def main():
+    arguments = parse_arguments()
+    jobs = create_jobs(arguments.level or [settings.LEVEL_FILE], arguments.policy or ["random"], arguments.games, arguments.ticks, arguments.seed)
+    report = Report()
+    results_file = open(arguments.results, 'w') if arguments.results else None
+    try:
+        for done, result in enumerate(run_batch(jobs, arguments.workers), 1):
+            report.add(result)
+            if results_file:
+                results_file.write(json.dumps(result) + "\n")
+            print(f"\r{done}/{len(jobs)} games", end="", file=sys.stderr)
+        print(file=sys.stderr)
+    finally:
+        if results_file:
+            results_file.close()
+
+    summary = json.dumps(report.summary(), indent=2)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            file.write(summary + "\n")
+    else:
+        print(summary)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import pygame
+
+class Camera:
+    def __init__(self, view_size, world_size):
+        self.view = pygame.Rect((0, 0), view_size)
+        self.world_size = world_size
+
+    @property
+    def offset(self):
+        return self.view.topleft
+
+    def follow(self, target):
+        # Center on the target but never show past the world's right/bottom edge; worlds
+        # smaller than the view stay anchored top-left like the fixed layout was
+        world_width, world_height = self.world_size
+        self.view.center = target.center
+        self.view.x = max(0, min(self.view.x, world_width - self.view.width))
+        self.view.y = max(0, min(self.view.y, world_height - self.view.height))
+
+    def visible(self, rect):
+        return self.view.colliderect(rect)
+
+    def to_screen(self, position):
+        return position[0] - self.view.x, position[1] - self.view.y
@@ -0,0 +1,29 @@
+import numpy as np
+import pygame
+import settings
+
+WALL_TILES = ('1', '2')
+
+class CollisionGrid:
+    def __init__(self, walls, tile_size=None):
+        # walls: (height, width) array, nonzero on wall tiles
+        self.tile_size = tile_size or settings.TILE_SIZE
+        self.height, self.width = walls.shape
+        self.cells = bytearray((walls != 0).astype(np.uint8).tobytes())
+
+    def is_wall(self, tile_x, tile_y):
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height and self.cells[tile_y * self.width + tile_x] == 1
+
+    def collide(self, rect):
+        # Scan the (at most 2x2) tiles under rect in row-major order so the first hit
+        # is the same wall spritecollideany returned from the old per-tile wall sprites
+        size = self.tile_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        for tile_y in range(top, bottom + 1):
+            for tile_x in range(left, right + 1):
+                if self.is_wall(tile_x, tile_y):
+                    return pygame.Rect(tile_x * size, tile_y * size, size, size)
+        return None
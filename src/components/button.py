@@ -1,5 +1,6 @@
 import pygame
 import pygame.freetype
+from text_cache import render_text
 
 class Button:
     def __init__(self, screen, pos, text_input, action, font, bold_font, font_size, color, hover_color, rect_hover_color):
@@ -16,7 +17,7 @@ class Button:
         self.update_text(self.font, self.color)
 
     def update_text(self, font, color):
-        self.text, self.rect = font.render(self.text_input, color, size=self.font_size)
+        self.text, self.rect = render_text(font, self.text_input, color, self.font_size)
         self.rect.topleft = (self.x_pos, self.y_pos)
 
     def update(self):
@@ -1,5 +1,7 @@
 import pygame
 import settings
+from asset_manager import assets
+from text_cache import render_text
 
 class Slider:
     ARROW_SIZE = (20, 20)
@@ -21,17 +23,17 @@ class Slider:
         self.current_value = getattr(settings, self.action)
         self.bar_width = 150
 
-        self.right_arrow, self.right_arrow_hover = self.load_arrows()
-        self.left_arrow = pygame.transform.flip(self.right_arrow, True, False)
-        self.left_arrow_hover = pygame.transform.flip(self.right_arrow_hover, True, False)
+        self.right_arrow, self.right_arrow_hover, self.left_arrow, self.left_arrow_hover = self.load_arrows()
 
         self.update_texts(self.color)
         self.update_rect()
 
     def load_arrows(self):
-        right_arrow = self.load_and_scale_image("assets/images/ui/right_arrow_white.png", self.ARROW_SIZE)
-        right_arrow_hover = self.load_and_scale_image("assets/images/ui/right_arrow_black.png", self.ARROW_SIZE)
-        return right_arrow, right_arrow_hover
+        right_arrow = assets.image("assets/images/ui/right_arrow_white.png", self.ARROW_SIZE)
+        right_arrow_hover = assets.image("assets/images/ui/right_arrow_black.png", self.ARROW_SIZE)
+        left_arrow = assets.image("assets/images/ui/right_arrow_white.png", self.ARROW_SIZE, flip=(True, False))
+        left_arrow_hover = assets.image("assets/images/ui/right_arrow_black.png", self.ARROW_SIZE, flip=(True, False))
+        return right_arrow, right_arrow_hover, left_arrow, left_arrow_hover
 
     def draw_arrows(self, hover=False):
         left_arrow = self.left_arrow_hover if hover else self.left_arrow
@@ -39,12 +41,8 @@ class Slider:
         self.screen.blit(left_arrow, self.left_arrow_rect)
         self.screen.blit(right_arrow, self.right_arrow_rect)
 
-    def load_and_scale_image(self, path, size):
-        image = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(image, size)
-
     def update_texts(self, color):
-        self.name_text, self.name_rect = self.font.render(self.name, color, size=self.font_size)
+        self.name_text, self.name_rect = render_text(self.font, self.name, color, self.font_size)
 
     def update_rect(self):
         self.name_rect.midleft = (self.x_pos + self.PADDING, self.y_pos)
@@ -0,0 +1,174 @@
+import numpy as np
+import pygame
+import settings
+from layers import MazeLayer, PelletLayer
+from level_compiler import load_compiled
+from navigation import HEADINGS
+from pellets import PELLET, POWER_PELLET
+from simulation import Simulation
+from swarm import MODES
+
+ACTIONS = [None] + HEADINGS  # Discrete action -> held direction; 0 keeps the current one
+CHANNELS = ("walls", "pellets", "power_pellets", "player", "scatter_ghosts", "chase_ghosts", "frightened_ghosts")
+WALLS, PELLETS, POWER_PELLETS, PLAYER, GHOSTS = range(5)  # Ghost channels follow in swarm.MODES order
+
+class PacmanEnv:
+    # Gym-style reset()/step() over one Simulation. Observations are uint8 tile channels
+    # (CHANNELS x height x width) kept up to date in place: only the cells that changed are written
+    def __init__(self, level_file=None, seed=0, ticks_per_step=1, max_ticks=None, batched_ghosts=False, render_mode=None, observation=None):
+        if render_mode not in (None, "rgb_array"):
+            raise ValueError(f"unsupported render mode {render_mode!r}")
+        self.render_mode = render_mode
+        self.simulation = Simulation(level_file, headless=render_mode is None, batched_ghosts=batched_ghosts, seed=seed)
+        self.simulation.end_on_death = True
+        self.ticks_per_step = ticks_per_step
+        self.max_ticks = max_ticks
+        self.walls = self.simulation.walls
+        self.height, self.width = self.walls.shape
+        # Owned by a VectorEnv when it hands in a slice of its batch array
+        self.observation = observation if observation is not None else np.zeros((len(CHANNELS), self.height, self.width), dtype=np.uint8)
+        self.planes = self.observation.reshape(len(CHANNELS), -1)  # Flat view for cell indexing
+        self.player_cell = None
+        self.ghost_cells = []
+        self.surface = None
+        if render_mode:
+            world_size = (self.width * settings.TILE_SIZE, self.height * settings.TILE_SIZE)
+            self.surface = pygame.Surface(world_size)
+            self.maze_layer = MazeLayer(self.simulation.tiles, self.simulation.wall_shapes, world_size)
+        self.reset_observation()
+
+    @property
+    def action_count(self):
+        return len(ACTIONS)
+
+    def reset(self, seed=None):
+        self.simulation.reset(seed)
+        self.reset_observation()
+        return self.observation, self.info()
+
+    def reset_observation(self):
+        simulation = self.simulation
+        observation = self.observation
+        pellets = np.frombuffer(simulation.pellets.cells, dtype=np.uint8).reshape(self.height, self.width)
+        observation[WALLS] = self.walls
+        observation[PELLETS] = pellets == PELLET
+        observation[POWER_PELLETS] = pellets == POWER_PELLET
+        observation[PLAYER:] = 0
+        simulation.pellets.drain_eaten()
+        if self.render_mode:
+            self.pellet_layer = PelletLayer(simulation.pellets)
+        self.player_cell = None
+        self.ghost_cells = []
+        self.update_actors()
+
+    def step(self, action):
+        simulation = self.simulation
+        score = simulation.player.score
+        direction = ACTIONS[action]
+        for _ in range(self.ticks_per_step):
+            simulation.step(direction)
+            if simulation.dead:
+                break
+        eaten = simulation.pellets.drain_eaten()
+        for tile_x, tile_y in eaten:
+            self.observation[PELLETS:POWER_PELLETS + 1, tile_y, tile_x] = 0
+        if self.render_mode:
+            self.pellet_layer.patch(eaten)
+        self.update_actors()
+        terminated = simulation.dead or simulation.pellets.remaining == 0
+        truncated = not terminated and self.max_ticks is not None and simulation.tick >= self.max_ticks
+        return self.observation, simulation.player.score - score, terminated, truncated, self.info()
+
+    def update_actors(self):
+        # Clear last step's player and ghost cells and mark the new ones
+        simulation = self.simulation
+        planes = self.planes
+        size = settings.TILE_SIZE
+        width, height = self.width, self.height
+        if self.player_cell is not None:
+            planes[PLAYER, self.player_cell] = 0
+        x, y = simulation.player_tile()
+        self.player_cell = y * width + x if 0 <= x < width and 0 <= y < height else None
+        if self.player_cell is not None:
+            planes[PLAYER, self.player_cell] = 1
+
+        for cell in self.ghost_cells:
+            planes[cell] = 0
+        # Ghosts mid-teleport are off the grid and not shown
+        swarm = simulation.ghost_swarm
+        if swarm:
+            xs, ys = (swarm.x + size // 2) // size, (swarm.y + size // 2) // size
+            inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            self.ghost_cells = [(GHOSTS + swarm.modes[inside], ys[inside] * width + xs[inside])]
+        else:
+            # A handful of sprites: plain indexing beats building arrays for them
+            self.ghost_cells = []
+            for ghost in simulation.ghosts:
+                x, y = ghost.rect.centerx // size, ghost.rect.centery // size
+                if 0 <= x < width and 0 <= y < height:
+                    self.ghost_cells.append((GHOSTS + MODES.index(ghost.mode), y * width + x))
+        for cell in self.ghost_cells:
+            planes[cell] = 1
+
+    def info(self):
+        simulation = self.simulation
+        return {"score": simulation.player.score, "tick": simulation.tick, "pellets_remaining": simulation.pellets.remaining, "death_tile": simulation.death_tile}
+
+    def render(self):
+        # Zero-copy (height, width, 3) view of the rendered maze. The view locks the surface,
+        # so it has to be released (or copied) before the next render()
+        if self.surface is None:
+            raise RuntimeError("create the environment with render_mode='rgb_array' to render it")
+        if self.surface.get_locked():
+            raise RuntimeError("the previous render() view is still alive; delete or copy it first")
+        simulation = self.simulation
+        simulation.sync_ghosts()
+        self.maze_layer.draw(self.surface)
+        self.pellet_layer.draw(self.surface)
+        time = simulation.time
+        simulation.player.animate(time)
+        simulation.player.draw(self.surface)
+        for ghost in simulation.ghosts:
+            ghost.animate(time)
+            ghost.draw(self.surface)
+        return pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+
+class VectorEnv:
+    # N environments stepped in lockstep. Each one writes its observation straight into its slice
+    # of one (N, CHANNELS, height, width) array; finished episodes reset on the same step
+    def __init__(self, count, level_file=None, seed=0, **options):
+        compiled = load_compiled(level_file or settings.LEVEL_FILE)
+        shape = (count, len(CHANNELS), compiled.height, compiled.width)
+        self.observations = np.zeros(shape, dtype=np.uint8)
+        self.envs = [PacmanEnv(level_file, seed + index, observation=self.observations[index], **options) for index in range(count)]
+        self.seeds = [seed + index for index in range(count)]
+        self.rewards = np.zeros(count, dtype=np.float32)
+        self.terminated = np.zeros(count, dtype=bool)
+        self.truncated = np.zeros(count, dtype=bool)
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seeds = [seed + index for index in range(len(self.envs))]
+        infos = [env.reset(env_seed)[1] for env, env_seed in zip(self.envs, self.seeds)]
+        return self.observations, infos
+
+    def step(self, actions):
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            _, reward, terminated, truncated, info = env.step(int(action))
+            self.rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            if terminated or truncated:
+                info["final_observation"] = env.observation.copy()
+                # Each slot walks its own seed sequence, so no two episodes share a seed
+                self.seeds[index] += len(self.envs)
+                env.reset(self.seeds[index])
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def render(self):
+        return [env.render() for env in self.envs]
@@ -1,11 +1,19 @@
 import pygame
 import os
+import sys
 import pygame.freetype
 from pygame.locals import *
-from sprites.player import Player
 import settings
-from level import load_level
+from simulation import Simulation
+from layers import MazeLayer, PelletLayer
+from camera import Camera
+from renderer import DirtyRects
+from profiler import profiler
+from replay import InputRecorder, state_checksum
+from simulation_thread import SimulationThread
+from savestate import RewindBuffer, save_state, load_state
 from menu import MainMenu, PauseMenu
+from text_cache import render_text
 
 # Set the process DPI awareness
 if os.name == "nt":
@@ -13,7 +21,10 @@ if os.name == "nt":
     ctypes.windll.user32.SetProcessDPIAware()
 
 class Game:
-    def __init__(self):
+    def __init__(self, replay=None, record_path=None):
+        self.replay = replay
+        self.record_path = record_path
+        self.replay_matches = None  # Set when a replay's log runs out: did the final state match
         self.init_pygame()
         self.load_resources()
         self.setup_display()
@@ -23,7 +34,7 @@ class Game:
         self.paused = False
         self.main_menu = MainMenu(self.screen, self.oxanium, self.oxanium_bold)
         self.pause_menu = PauseMenu(self.screen, self.oxanium, self.oxanium_bold)
-        self.show_main_menu = True
+        self.show_main_menu = replay is None  # Replays start playing straight away
 
         # FPS display variables
         self.fps_text = None
@@ -69,91 +80,313 @@ class Game:
         self.map_area_surface = pygame.Surface((settings.GAME_WIDTH, self.map_area_height))
 
     def init_game_objects(self):
-        self.walls = pygame.sprite.Group()
-        self.scores = pygame.sprite.Group()
-        self.ghosts = pygame.sprite.Group()
-        self.level, player_x, player_y, self.blinky, self.pinky, self.inky, self.clyde = load_level(
-            settings.LEVEL_FILE, self.walls, self.scores, settings.TILE_SIZE
-        )
-        self.player = Player(player_x, player_y)
-        self.ghosts.add(self.blinky, self.pinky, self.inky, self.clyde)
+        if self.replay:
+            self.simulation = self.replay.simulation(settings.LEVEL_FILE, headless=False, batched_ghosts=settings.BATCHED_GHOSTS)
+            self.replay_directions = self.replay.directions()
+        else:
+            self.simulation = Simulation(settings.LEVEL_FILE, headless=False, batched_ghosts=settings.BATCHED_GHOSTS)
+            self.replay_directions = None
+        self.simulation_thread = None
+        if settings.THREADED_SIMULATION and not self.replay:
+            # The thread steps its own simulation; self.simulation only mirrors its snapshots for drawing.
+            # Replays stay on the main thread, where every tick is checked against the log
+            self.simulation_thread = SimulationThread(Simulation(settings.LEVEL_FILE, headless=True, batched_ghosts=settings.BATCHED_GHOSTS))
+            self.simulation_thread.start()
+        if self.record_path:
+            recorded = self.live_simulation()
+            recorded.recorder = InputRecorder(recorded)
+        self.rewind = None
+        if settings.REWIND and not (self.replay or self.record_path or self.simulation_thread):
+            # Stepping back would desync a recording or a replay's input log
+            self.rewind = RewindBuffer(settings.REWIND_MEMORY, settings.REWIND_KEYFRAME_INTERVAL)
+            self.rewind.push(save_state(self.simulation))
+        world_size = (self.simulation.navigation.width * settings.TILE_SIZE, self.simulation.navigation.height * settings.TILE_SIZE)
+        self.camera = Camera(self.map_area_surface.get_size(), world_size)
+        self.maze_layer = MazeLayer(self.simulation.tiles, self.simulation.wall_shapes, world_size)
+        self.pellet_layer = PelletLayer(self.simulation.pellets)
+        self.accumulator = 0
+        self.renderer = DirtyRects()
+        self.sprite_rects = {}  # Where each moving object was drawn last frame, in map area coordinates
+        self.drawn_offset = None
+        self.drawn_score = None
 
     def run(self):
+        drawn_screen = None  # The (main menu, paused) screen last drawn while idle
         while self.running:
-            self.events()
-            delta_time = self.clock.tick(settings.FPS) / 1000.0
-            if self.show_main_menu:
-                self.main_menu.draw()
-            elif not self.paused:
-                self.update(delta_time)
-                self.draw()
+            events = None
+            if self.is_idle():
+                screen = (self.show_main_menu, self.paused)
+                if screen != drawn_screen:
+                    # Draw a screen that just came up before blocking: no window event may ever arrive to prompt it
+                    events = []
+                    drawn_screen = screen
+                else:
+                    events = self.wait_events()
+                    if not events:
+                        continue  # Timed out with nothing to do: the last frame is still on screen
             else:
-                self.draw()  # Draw game in background
-                self.pause_menu.draw()
+                drawn_screen = None
+            with profiler.phase("frame"):
+                self.run_frame(events)
+        if self.simulation_thread:
+            self.simulation_thread.stop()
+        if self.record_path:
+            self.live_simulation().recorder.save(self.record_path)
+
+    def live_simulation(self):
+        return self.simulation_thread.simulation if self.simulation_thread else self.simulation
+
+    def run_frame(self, events=None):
+        if events is not None:
+            with profiler.phase("events"):
+                self.events(events)
+            self.clock.tick()  # Time spent blocked must not reach the simulation
+            delta_time = 0
+        else:
+            with profiler.phase("events"):
+                self.events(pygame.event.get())
+            with profiler.phase("tick"):
+                delta_time = self.clock.tick(settings.FPS) / 1000.0
+        if self.simulation_thread:
+            self.simulation_thread.set_active(not self.show_main_menu and not self.paused)
+        with profiler.phase("fps"):
             self.update_fps_display(delta_time)
-            pygame.display.flip()
+        if self.show_main_menu:
+            with profiler.phase("draw"):
+                self.main_menu.draw()
+            self.renderer.invalidate()
+        elif not self.paused:
+            with profiler.phase("update"):
+                self.update(delta_time)
+            with profiler.phase("draw"):
+                self.draw_frame()
+        else:
+            with profiler.phase("draw"):
+                self.pause_menu.draw()  # The game behind it is a frozen backdrop, not re-rendered
+            self.renderer.invalidate()
+        self.draw_fps()
+        if profiler.overlay:
+            profiler.draw_overlay(self.screen, self.uifont, (20, 60))
+        with profiler.phase("present"):
+            self.renderer.present(self.screen)
 
     def update_fps_display(self, delta_time):
         self.fps_timer += delta_time
         if self.fps_timer >= 1.0:  # Update FPS every second
-            self.fps_text, self.fps_rect = self.oxanium.render("FPS: " + str(int(self.clock.get_fps())) + " | Vsync: " + str(getattr(settings, "VSYNC")), settings.WHITE, size=24)
-            self.fps_timer = 0
-        if self.fps_text and self.fps_rect and settings.SHOW_FPS:
+            self.fps_text, self.fps_rect = render_text(self.oxanium, "FPS: " + str(int(self.clock.get_fps())) + " | Vsync: " + str(getattr(settings, "VSYNC")), settings.WHITE, 24)
             self.fps_rect.topleft = (20, 20)
+            self.fps_timer = 0
+            self.renderer.invalidate()  # New text over the old one needs a clean frame
+
+    def draw_fps(self):
+        # Dirty frames leave the previous text on screen; blitting it again would blend it twice
+        if self.fps_text and self.fps_rect and settings.SHOW_FPS and self.renderer.full:
             self.screen.blit(self.fps_text, self.fps_rect)
 
-    def events(self):
-        for event in pygame.event.get():
+    def is_idle(self):
+        return settings.IDLE_MODE and (self.show_main_menu or self.paused)
+
+    def wait_events(self):
+        # Block until something happens (or the timeout passes) instead of repainting at FPS
+        event = pygame.event.wait(settings.IDLE_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def events(self, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                self.renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                profiler.export(settings.PROFILER_TRACE_FILE)
             elif event.type == pygame.KEYDOWN:
                 if self.show_main_menu:
                     self.running, self.show_main_menu = self.main_menu.events(event)
                 elif self.paused:
                     self.running, self.paused = self.pause_menu.events(event)
+                    if not self.paused:
+                        self.pause_menu.set_background(None)
                 elif not self.paused and event.key == pygame.K_ESCAPE:
                     self.paused = True
+                    self.capture_pause_backdrop()
             elif event.type == pygame.VIDEORESIZE:
                 self.screen_width, self.screen_height = event.size
                 self.update_offsets()
                 display_mode = pygame.FULLSCREEN if settings.DISPLAY_MODE == "fullscreen" else pygame.RESIZABLE
                 self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), display_mode)
+                self.maze_layer.invalidate()
+                self.renderer.invalidate()
+                if self.paused:
+                    self.capture_pause_backdrop()
 
     def update(self, delta_time):
         keys = pygame.key.get_pressed()
-        self.player.update(keys, self.level, self.walls, self.scores, delta_time)
-        player_pos = (
-            self.player.rect.center[0] // settings.TILE_SIZE,
-            self.player.rect.center[1] // settings.TILE_SIZE
-        )
-        self.ghosts.update(self.level, self.walls, delta_time, player_pos)
+        if self.replay_directions is None:
+            self.simulation.player.set_desired_direction(keys)
+        if self.simulation_thread:
+            self.simulation_thread.set_input(self.simulation.player.desired_direction)
+            self.simulation_thread.show(self.simulation)
+            return
+        # Fixed timestep: render rate and simulation rate are independent
+        self.accumulator = min(self.accumulator + delta_time, settings.MAX_FRAME_TIME)
+        rewinding = self.rewind is not None and keys[pygame.K_BACKSPACE]
+        while self.accumulator >= self.simulation.delta_time:
+            if rewinding:
+                self.step_back()
+            else:
+                self.simulation.step(self.next_replay_direction())
+                if self.rewind is not None:
+                    self.rewind.push(save_state(self.simulation))
+            self.accumulator -= self.simulation.delta_time
+
+    def step_back(self):
+        # The newest buffered state is the current one; drop it and load the one before
+        for _ in range(settings.REWIND_SPEED):
+            if len(self.rewind) < 2:
+                break
+            self.rewind.pop()
+        pellets = self.simulation.pellets
+        cells = bytes(pellets.cells)
+        load_state(self.simulation, self.rewind.latest())
+        pellets.drain_eaten()
+        if pellets.cells != cells:
+            # Pellets came back: the cached chunks and the frame on screen no longer show them
+            self.pellet_layer.invalidate()
+            self.renderer.invalidate()
+
+    def next_replay_direction(self):
+        # One recorded direction per tick; once the log runs out the keyboard takes over
+        if self.replay_directions is None:
+            return None
+        direction = next(self.replay_directions, StopIteration)
+        if direction is StopIteration:
+            self.replay_directions = None
+            self.replay_matches = state_checksum(self.simulation) == self.replay.checksum
+            print(f"Replay finished after {self.simulation.tick} ticks: " + ("final state matches the recording" if self.replay_matches else "final state differs from the recording"), file=sys.stderr)
+            return None
+        return direction
 
     def draw(self):
         self.screen.fill(settings.BLACK)
-        self.draw_ui()
+        with profiler.phase("draw.ui"):
+            self.draw_ui()
         self.draw_game_objects()
-        if self.paused:
-            self.pause_menu.draw()
+
+    def draw_frame(self):
+        # Full frames when the profiler overlay is on top (it changes every frame) or when there are
+        # so many moving objects that repainting each one costs more than redrawing everything
+        if (settings.DIRTY_RECTS and not self.renderer.full and len(self.sprite_rects) <= settings.DIRTY_RECTS_MAX_SPRITES
+                and not self.fps_overlaps_game() and not profiler.overlay):
+            self.draw_changes()
+        else:
+            self.renderer.invalidate()
+            self.draw()
+
+    def fps_overlaps_game(self):
+        # Text drawn over the map would have to be redrawn every frame
+        game_rect = pygame.Rect(int(self.x_offset), int(self.y_offset), settings.GAME_WIDTH, settings.GAME_HEIGHT)
+        return settings.SHOW_FPS and self.fps_rect is not None and self.fps_rect.colliderect(game_rect)
+
+    def capture_pause_backdrop(self):
+        # Render the game world once, then dim and blur that copy for the whole pause
+        self.draw()
+        backdrop = self.screen.copy()
+        if settings.PAUSE_BACKDROP_BLUR > 1:
+            width, height = backdrop.get_size()
+            small = pygame.transform.smoothscale(backdrop, (max(1, width // settings.PAUSE_BACKDROP_BLUR), max(1, height // settings.PAUSE_BACKDROP_BLUR)))
+            backdrop = pygame.transform.smoothscale(small, (width, height))
+        if settings.PAUSE_BACKDROP_DIM:
+            shade = pygame.Surface(backdrop.get_size(), pygame.SRCALPHA)
+            shade.fill((*settings.MENU_BG_COLOR, settings.PAUSE_BACKDROP_DIM))
+            backdrop.blit(shade, (0, 0))
+        self.pause_menu.set_background(backdrop)
 
     def draw_ui(self):
         self.top_ui_surface.fill(settings.BLACK)
-        score_text, score_text_rect = self.uifont.render(f"Score: {self.player.score:02}", settings.WHITE, size=16)
+        score_text, score_text_rect = render_text(self.uifont, f"Score: {self.simulation.player.score:02}", settings.WHITE, 16)
         score_text_rect.center = (settings.GAME_WIDTH // 2, self.top_ui_height // 2)
         self.top_ui_surface.blit(score_text, score_text_rect)
         self.game_surface.blit(self.top_ui_surface, (0, 0))
+        self.drawn_score = self.simulation.player.score
 
         self.bottom_ui_surface.fill(settings.BLACK)
         self.game_surface.blit(self.bottom_ui_surface, (0, settings.GAME_HEIGHT - self.bottom_ui_height))
+        profiler.count("blits", 3)
 
     def draw_game_objects(self):
-        self.map_area_surface.fill(settings.BLACK)
-        self.walls.draw(self.map_area_surface)
-        self.scores.draw(self.map_area_surface)
-        self.player.draw(self.map_area_surface)
-        if getattr(settings, "SHOW_DIRECTION_ARROW", False):
-            direction_arrow = self.player.draw_direction_arrow()
-            self.map_area_surface.blit(direction_arrow[0], direction_arrow[1])
-        for ghost in self.ghosts:
-            ghost.draw(self.map_area_surface)
+        simulation = self.simulation
+        camera = self.camera
+        simulation.sync_ghosts()
+        camera.follow(simulation.player.rect)
+        with profiler.phase("draw.walls"):
+            self.maze_layer.draw(self.map_area_surface, camera)
+        with profiler.phase("draw.pellets"):
+            self.pellet_layer.update()
+            self.pellet_layer.draw(self.map_area_surface, camera)
+        self.draw_sprites()
+        self.drawn_offset = camera.offset
         self.game_surface.blit(self.map_area_surface, (0, self.top_ui_height))
         self.screen.blit(self.game_surface, (self.x_offset, self.y_offset))
+        profiler.count("blits", 2)
+
+    def draw_sprites(self):
+        simulation = self.simulation
+        camera = self.camera
+        surface = self.map_area_surface
+        time = simulation.time
+        with profiler.phase("draw.player"):
+            simulation.player.animate(time)
+            rects = {simulation.player: simulation.player.draw(surface, camera.offset)}
+            if getattr(settings, "SHOW_DIRECTION_ARROW", False):
+                direction_arrow = simulation.player.draw_direction_arrow()
+                rects["arrow"] = surface.blit(direction_arrow[0], camera.to_screen(direction_arrow[1]))
+        with profiler.phase("draw.ghosts"):
+            for ghost in simulation.ghosts:
+                # Ghost images overhang their tile, so cull against a slightly larger box
+                if camera.visible(ghost.rect.inflate(settings.TILE_SIZE, settings.TILE_SIZE)):
+                    ghost.animate(time)
+                    rects[ghost] = ghost.draw(surface, camera.offset)
+        self.sprite_rects = rects
+        profiler.count("blits", len(rects))
+
+    def draw_changes(self):
+        # Everything else on screen is still valid from the last frame: erase the moving objects by
+        # repainting the static layers under their old bounds, draw them again and push only those areas
+        simulation = self.simulation
+        camera = self.camera
+        simulation.sync_ghosts()
+        camera.follow(simulation.player.rect)
+        if camera.offset != self.drawn_offset:
+            # Scrolling moves the whole map
+            self.renderer.invalidate()
+            self.draw()
+            return
+        size = settings.TILE_SIZE
+        view = camera.view
+        eaten = [pygame.Rect(x * size - view.x, y * size - view.y, size, size) for x, y in self.pellet_layer.update()]
+        previous = self.sprite_rects
+        with profiler.phase("draw.restore"):
+            for rect in list(previous.values()) + eaten:
+                self.maze_layer.draw(self.map_area_surface, camera, rect)
+                self.pellet_layer.draw(self.map_area_surface, camera, rect)
+        self.draw_sprites()
+
+        left, top = int(self.x_offset), int(self.y_offset)
+        if simulation.player.score != self.drawn_score:
+            with profiler.phase("draw.ui"):
+                self.draw_ui()
+                self.renderer.add(self.screen.blit(self.top_ui_surface, (left, top)))
+                profiler.count("blits")
+        dirty = eaten + [
+            previous[key].union(self.sprite_rects[key]) if key in previous and key in self.sprite_rects
+            else previous[key] if key in previous else self.sprite_rects[key]
+            for key in previous.keys() | self.sprite_rects.keys()
+        ]
+        map_rect = self.map_area_surface.get_rect()
+        for rect in dirty:
+            rect = rect.clip(map_rect)
+            self.renderer.add(self.screen.blit(self.map_area_surface, (left + rect.x, top + self.top_ui_height + rect.y), rect))
+        profiler.count("blits", len(dirty))
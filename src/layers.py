@@ -0,0 +1,142 @@
+import numpy as np
+import pygame
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import settings
+from asset_manager import assets
+from level_compiler import WALL_SHAPES
+from pellets import PELLET, POWER_PELLET, pellet_width
+from profiler import profiler
+
+WALL_IMAGE_DIR = "assets/images/wall"
+
+def create_pellet_images(tile_size):
+    images = {}
+    for kind in (PELLET, POWER_PELLET):
+        width = pellet_width(kind, tile_size)
+        image = pygame.Surface((width, width), pygame.SRCALPHA)
+        if kind == POWER_PELLET:
+            pygame.draw.circle(image, settings.SCORE_COLOR, (width / 2, width / 2), width / 2)
+        else:
+            image.fill(settings.SCORE_COLOR)
+        images[kind] = image
+    return images
+
+class ChunkLayer(ABC):
+    # The world cut into CHUNK_TILES x CHUNK_TILES tile squares, each rendered the first time it
+    # scrolls into view and kept in a bounded LRU, so memory and frame time do not grow with the map
+    def __init__(self, world_size, tile_size):
+        self.tile_size = tile_size
+        self.chunk_size = settings.CHUNK_TILES * tile_size
+        self.columns = -(-world_size[0] // self.chunk_size)
+        self.rows = -(-world_size[1] // self.chunk_size)
+        self.chunks = OrderedDict()
+        self.builds = 0
+
+    def invalidate(self):
+        self.chunks.clear()
+
+    @abstractmethod
+    def render_chunk(self, column, row):
+        pass
+
+    def chunk(self, column, row):
+        surface = self.chunks.get((column, row))
+        if surface is None:
+            surface = self.render_chunk(column, row)
+            self.chunks[(column, row)] = surface
+            self.builds += 1
+            if len(self.chunks) > settings.CHUNK_CACHE_SIZE:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end((column, row))
+        return surface
+
+    def visible_chunks(self, view):
+        size = self.chunk_size
+        for row in range(max(0, view.top // size), min(self.rows, (view.bottom - 1) // size + 1)):
+            for column in range(max(0, view.left // size), min(self.columns, (view.right - 1) // size + 1)):
+                yield column, row
+
+    def draw(self, surface, camera=None, area=None):
+        # area (surface coordinates) limits drawing to that part of the view, for dirty rect repaints
+        view = camera.view if camera else surface.get_rect()
+        size = self.chunk_size
+        if area is not None:
+            clip = surface.get_clip()
+            surface.set_clip(area)
+        blits = [(self.chunk(column, row), (column * size - view.x, row * size - view.y)) for column, row in self.visible_chunks(area.move(view.topleft) if area is not None else view)]
+        surface.blits(blits, doreturn=False)
+        profiler.count("blits", len(blits))
+        if area is not None:
+            surface.set_clip(clip)
+
+class MazeLayer(ChunkLayer):
+    def __init__(self, tiles, shapes, size):
+        # tiles and shapes: the level's compiled planes; a nonzero shape is a wall with an image
+        super().__init__(size, settings.TILE_SIZE)
+        self.tiles = tiles
+        self.shapes = shapes
+        self.key = self.cache_key()
+
+    def cache_key(self):
+        return settings.TILE_SIZE, settings.QUALITY_MODE
+
+    def render_chunk(self, column, row):
+        # Background and the chunk's walls composed once; converted to the display format for fast blits
+        surface = pygame.Surface((self.chunk_size, self.chunk_size))
+        surface.fill(settings.BLACK)
+        first_x, first_y = column * settings.CHUNK_TILES, row * settings.CHUNK_TILES
+        shapes = self.shapes[first_y:first_y + settings.CHUNK_TILES, first_x:first_x + settings.CHUNK_TILES]
+        ys, xs = np.nonzero(shapes)
+        tiles = self.tiles[first_y + ys, first_x + xs].tobytes().decode('latin-1')
+        size = self.tile_size
+        images = assets.atlas(WALL_IMAGE_DIR, (size, size))
+        surface.blits([
+            (images[f"{tile}-{WALL_SHAPES[shape]}"], (x * size, y * size))
+            for y, x, tile, shape in zip(ys.tolist(), xs.tolist(), tiles, shapes[ys, xs].tolist())
+        ], doreturn=False)
+        if pygame.display.get_surface():
+            surface = surface.convert()
+        return surface
+
+    def draw(self, surface, camera=None, area=None):
+        if self.key != self.cache_key():
+            self.invalidate()
+            self.key = self.cache_key()
+        view = camera.view if camera else surface.get_rect()
+        if view.right > self.columns * self.chunk_size or view.bottom > self.rows * self.chunk_size:
+            surface.fill(settings.BLACK, area)  # The view reaches past the last chunk
+        super().draw(surface, camera, area)
+
+class PelletLayer(ChunkLayer):
+    def __init__(self, pellets):
+        super().__init__((pellets.width * pellets.tile_size, pellets.height * pellets.tile_size), pellets.tile_size)
+        self.pellets = pellets
+        self.images = create_pellet_images(self.tile_size)
+        self.pellets.drain_eaten()
+
+    def render_chunk(self, column, row):
+        surface = pygame.Surface((self.chunk_size, self.chunk_size), pygame.SRCALPHA)
+        size = self.tile_size
+        first_x, first_y = column * settings.CHUNK_TILES, row * settings.CHUNK_TILES
+        for tile_y in range(first_y, first_y + settings.CHUNK_TILES):
+            for tile_x in range(first_x, first_x + settings.CHUNK_TILES):
+                kind = self.pellets.kind_at(tile_x, tile_y)
+                if kind:
+                    image = self.images[kind]
+                    surface.blit(image, image.get_rect(center=((tile_x - first_x) * size + size // 2, (tile_y - first_y) * size + size // 2)))
+        return surface
+
+    def update(self):
+        return self.patch(self.pellets.drain_eaten())
+
+    def patch(self, eaten):
+        # Patch only the tiles eaten since the last frame, and only in chunks that are cached;
+        # the rest are rendered from the current pellets when they come back into view
+        size = self.tile_size
+        for tile_x, tile_y in eaten:
+            surface = self.chunks.get((tile_x // settings.CHUNK_TILES, tile_y // settings.CHUNK_TILES))
+            if surface is not None:
+                surface.fill((0, 0, 0, 0), ((tile_x % settings.CHUNK_TILES) * size, (tile_y % settings.CHUNK_TILES) * size, size, size))
+        return eaten
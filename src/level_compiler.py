@@ -0,0 +1,179 @@
+import hashlib
+import os
+import struct
+import weakref
+import numpy as np
+import settings
+from collision import WALL_TILES
+from pellets import PELLET_TILES
+
+MAGIC = b"PACLVL02"
+# magic, width, height, source sha1, spawn tiles (x, y) for SPAWN_TILES
+HEADER = struct.Struct("<8sII20s10i")
+SPAWN_TILES = "pBPIC"
+PLANES = 3  # tiles, wall shapes, pellet kinds
+PADDING_TILE = ' '
+
+WALL_SHAPES = (None, "circle-topright", "circle-topleft", "circle-bottomright", "circle-bottomleft", "line-horizontal", "line-vertical")
+# (dx, dy) of the neighbor behind each bit of the 8-bit wall mask
+NEIGHBOR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0), (1, -1), (-1, -1), (1, 1), (-1, 1))
+
+def wall_shape(mask):
+    top, bottom, left, right, top_right, top_left, bottom_right, bottom_left = (bool(mask >> bit & 1) for bit in range(8))
+    # The autotile rules load_level used per wall, evaluated once per possible mask
+    if (left and not right and not top and bottom) or (top and bottom and left and right and not bottom_left):
+        return 1
+    elif (not left and right and not top and bottom) or (top and bottom and left and right and not bottom_right):
+        return 2
+    elif (top and not bottom and left and not right) or (top and bottom and left and right and not top_left):
+        return 3
+    elif (top and not bottom and not left and right) or (top and bottom and left and right and not top_right):
+        return 4
+    elif (right and left) or ((right or left) and not (top or bottom)):
+        return 5
+    elif (top and bottom) or ((top or bottom) and not (right or left)):
+        return 6
+    return 0
+
+AUTOTILE = np.array([wall_shape(mask) for mask in range(256)], dtype=np.uint8)
+
+def tile_lookup(tiles):
+    table = np.zeros(256, dtype=np.uint8)
+    for tile, value in tiles.items():
+        table[ord(tile)] = value
+    return table
+
+WALL_LOOKUP = tile_lookup({tile: 1 for tile in WALL_TILES})
+PELLET_LOOKUP = tile_lookup(PELLET_TILES)
+
+# Cache path -> the CompiledLevel still mapping it, so a recompile can close the map first
+mapped_levels = weakref.WeakValueDictionary()
+
+class CompiledLevel:
+    def __init__(self, planes, spawns, digest):
+        self.tiles, self.shapes, self.pellets = planes
+        self.height, self.width = self.tiles.shape
+        self.spawns = spawns  # tile -> (x, y), only for tiles present in the level
+        self.digest = digest  # SHA-1 of the source text
+        self.mmap = getattr(planes, '_mmap', None)
+
+    def close(self):
+        # Windows will not replace a file that is still mapped
+        self.tiles = self.shapes = self.pellets = None
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                pass  # A caller still holds a plane; the map closes with its last view
+            self.mmap = None
+
+    def rows(self):
+        # The level as list-of-lists of characters, like the old text parser returned
+        text = self.tiles.tobytes().decode('latin-1')
+        return [list(text[start:start + self.width]) for start in range(0, len(text), self.width)]
+
+    def walls(self):
+        # 1 for every wall tile, 0 elsewhere; a new array, not a view of the map
+        return WALL_LOOKUP[self.tiles]
+
+def parse(text):
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    # Ragged rows are padded with empty floor so every row has the same width
+    width = max((len(line) for line in lines), default=0)
+    return np.array(
+        [np.frombuffer(line.ljust(width, PADDING_TILE).encode('latin-1'), dtype=np.uint8) for line in lines],
+        dtype=np.uint8
+    ).reshape(len(lines), width)
+
+def compile_tiles(tiles):
+    height, width = tiles.shape
+    walls = np.pad(WALL_LOOKUP[tiles], 1)  # Out of bounds counts as no wall
+    masks = np.zeros(tiles.shape, dtype=np.uint8)
+    for bit, (dx, dy) in enumerate(NEIGHBOR_OFFSETS):
+        masks |= walls[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] << bit
+    shapes = np.where(walls[1:-1, 1:-1] == 1, AUTOTILE[masks], 0).astype(np.uint8)
+    pellets = PELLET_LOOKUP[tiles]
+    spawns = {}
+    for tile in SPAWN_TILES:
+        found = np.flatnonzero(tiles == ord(tile))
+        if len(found):
+            # The last occurrence wins, as it did when the parser overwrote the spawn
+            spawns[tile] = (int(found[-1] % width), int(found[-1] // width))
+    return np.stack((tiles, shapes, pellets)), spawns
+
+def source_hash(text):
+    return hashlib.sha1(text.encode('latin-1')).digest()
+
+def level_hash(file_path):
+    # Content hash of a level file, as stored in the cache header and in replays
+    with open(file_path, 'r') as file:
+        return source_hash(file.read())
+
+def cache_path(file_path):
+    # Keyed by the absolute path: levels with the same file name in different directories
+    # must not share a cache
+    key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(settings.LEVEL_CACHE_DIR, f"{os.path.basename(file_path)}.{key}.bin")
+
+def pack_header(width, height, digest, spawns):
+    coordinates = []
+    for tile in SPAWN_TILES:
+        coordinates.extend(spawns.get(tile, (-1, -1)))
+    return HEADER.pack(MAGIC, width, height, digest, *coordinates)
+
+def unpack_spawns(coordinates):
+    return {
+        tile: (coordinates[2 * index], coordinates[2 * index + 1])
+        for index, tile in enumerate(SPAWN_TILES) if coordinates[2 * index] >= 0
+    }
+
+def compile_level(file_path, destination=None, text=None):
+    if text is None:
+        with open(file_path, 'r') as file:
+            text = file.read()
+    planes, spawns = compile_tiles(parse(text))
+    digest = source_hash(text)
+    destination = destination or cache_path(file_path)
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    # Write to a temporary file first so a crash never leaves a half-written cache behind
+    temporary = f"{destination}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(pack_header(planes.shape[2], planes.shape[1], digest, spawns))
+        file.write(planes.tobytes())
+    stale = mapped_levels.pop(destination, None)
+    if stale is not None:
+        stale.close()
+    os.replace(temporary, destination)
+    return CompiledLevel(planes, spawns, digest)
+
+def read_header(path):
+    try:
+        with open(path, 'rb') as file:
+            data = file.read(HEADER.size)
+    except OSError:
+        return None
+    if len(data) != HEADER.size:
+        return None
+    header = HEADER.unpack(data)
+    return header if header[0] == MAGIC else None
+
+def load_compiled(file_path):
+    # The content hash alone decides whether the cache is current: hashing the source is cheap
+    # next to parsing it, and timestamps can match across edits
+    with open(file_path, 'r') as file:
+        text = file.read()
+    path = cache_path(file_path)
+    header = read_header(path)
+    if header is None or header[3] != source_hash(text):
+        return compile_level(file_path, path, text)
+    _, width, height, digest, *coordinates = header
+    if os.path.getsize(path) != HEADER.size + PLANES * width * height:
+        return compile_level(file_path, path, text)
+    if width * height == 0:
+        return CompiledLevel(np.zeros((PLANES, height, width), dtype=np.uint8), unpack_spawns(coordinates), digest)
+    planes = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size, shape=(PLANES, height, width))
+    compiled = CompiledLevel(planes, unpack_spawns(coordinates), digest)
+    mapped_levels[path] = compiled
+    return compiled
@@ -1,13 +1,49 @@
+import argparse
+import time
 import pygame
 import sys
+import settings
 from game import Game
+from replay import Replay
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", metavar="PATH", help="record every tick's input to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded replay")
+    parser.add_argument("--fast", action="store_true", help="with --replay: run as fast as possible without a window")
+    return parser.parse_args()
+
+def fast_forward(replay):
+    simulation = replay.simulation(settings.LEVEL_FILE)
+    start = time.perf_counter()
+    matches = replay.run(simulation)
+    elapsed = time.perf_counter() - start
+    print(f"{replay.ticks} ticks in {elapsed:.2f}s ({replay.ticks / max(elapsed, 1e-9):.0f} ticks/s), score {simulation.player.score}")
+    print("final state matches the recording" if matches else "final state differs from the recording")
+    return 0 if matches else 1
 
 def main():
+    arguments = parse_arguments()
+    replay = None
+    if arguments.replay:
+        try:
+            replay = Replay.load(arguments.replay)
+            if arguments.fast:
+                sys.exit(fast_forward(replay))
+        except (OSError, ValueError) as e:
+            print(f"Error loading replay {arguments.replay}: {e}")
+            sys.exit(1)
     pygame.init()
-    game = Game()
+    try:
+        game = Game(replay, arguments.record)
+    except ValueError as e:
+        print(f"Error loading replay {arguments.replay}: {e}")
+        pygame.quit()
+        sys.exit(1)
     game.run()
     pygame.quit()
-    sys.exit()
+    # Same exit status as --fast: a replay that desynced fails
+    sys.exit(1 if game.replay_matches is False else 0)
 
 if __name__ == '__main__':
     main()
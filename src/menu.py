@@ -1,8 +1,11 @@
 import pygame
+from collections import OrderedDict
 from components.button import Button
 from components.selector import Selector
 from components.slider import Slider
 import settings
+from text_cache import render_text
+from profiler import profiler
 
 class BaseMenu:
     ITEM_VERTICAL_SPACING = 70
@@ -26,6 +29,8 @@ class BaseMenu:
 
         self.left_elements_cache = {}
         self.right_elements_cache = {}
+        self.frames = OrderedDict()  # state_key() -> composed frame, least recently used first
+        self.background = None
 
     def create_elements(self, menu_structure):
         for menu_name, menu_items in menu_structure.items():
@@ -79,17 +84,50 @@ class BaseMenu:
                         right_elements[title].append((Button(text_input=text, bold_font=self.bold_font, action=action["value"], **common_args), action))
         return right_elements
 
+    def state_key(self):
+        return (
+            self.current_menu, self.left_menu_item, self.right_menu_item,
+            self.right_menu_status, self.scroll_offset, self.screen.get_size()
+        )
+
+    def invalidate(self):
+        self.frames.clear()
+
+    def set_background(self, background):
+        self.background = background
+        self.invalidate()
+
     def draw(self):
-        self.screen.fill(settings.MENU_BG_COLOR)
+        # Idle frames are a single blit; a frame is only composed when the menu state changes
+        key = self.state_key()
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = pygame.Surface(self.screen.get_size())
+            if pygame.display.get_surface():
+                frame = frame.convert()
+            self.compose(frame)
+            self.frames[key] = frame
+            if len(self.frames) > settings.MENU_FRAME_CACHE_SIZE:
+                self.frames.popitem(last=False)
+        else:
+            self.frames.move_to_end(key)
+        self.screen.blit(frame, (0, 0))
+        profiler.count("blits")
+
+    def compose(self, frame):
+        if self.background:
+            frame.blit(self.background, (0, 0))
+        else:
+            frame.fill(settings.MENU_BG_COLOR)
         self.left_menu_surface.fill((0, 0, 0, 0))
         self.right_menu_surface.fill((0, 0, 0, 0))
         self.draw_title()
         self.draw_left_elements()
-        self.draw_right_menu()
-        self.screen.blit(self.left_menu_surface, (0, self.screen.get_height() / 4))
+        self.draw_right_menu(frame)
+        frame.blit(self.left_menu_surface, (0, frame.get_height() / 4))
 
     def draw_title(self):
-        title_text, title_text_rect = self.bold_font.render(self.current_menu.upper(), settings.WHITE, size=70)
+        title_text, title_text_rect = render_text(self.bold_font, self.current_menu.upper(), settings.WHITE, 70)
         title_text_rect.topleft = (50, self.left_menu_surface.get_height() / 4)
         self.left_menu_surface.blit(title_text, title_text_rect)
 
@@ -98,11 +136,12 @@ class BaseMenu:
             element.change_style(i == self.left_menu_item)
             element.update()
 
-    def draw_right_menu(self):
+    def draw_right_menu(self, frame):
         right_menu_key = self.left_elements[self.left_menu_item].action
         if right_menu_key in self.right_elements_cache.get(self.current_menu, {}):
             content_height = len(self.right_elements_cache[self.current_menu][right_menu_key]) * self.ITEM_VERTICAL_SPACING
-            self.right_menu_content_surface = pygame.transform.scale(self.right_menu_content_surface,(self.right_menu_surface.get_width(), content_height))
+            if self.right_menu_content_surface.get_height() != content_height:
+                self.right_menu_content_surface = pygame.Surface((self.right_menu_surface.get_width(), content_height), pygame.SRCALPHA)
             self.right_menu_content_surface.fill((0, 0, 0, 0))
 
             if self.right_menu_status:
@@ -118,7 +157,7 @@ class BaseMenu:
                     element.update()
 
             self.blit_right_menu_content()
-        self.screen.blit(self.right_menu_surface, (self.screen.get_width() / 4, self.screen.get_height() / 4))
+        frame.blit(self.right_menu_surface, (frame.get_width() / 4, frame.get_height() / 4))
 
     def blit_right_menu_content(self):
         if self.right_menu_content_surface.get_height() <= self.right_menu_surface.get_height():
@@ -155,6 +194,8 @@ class BaseMenu:
             self.scroll_offset = self.right_menu_item - self.MAX_VISIBLE_ITEMS + 1
 
     def select_menu_item(self, event):
+        # Selectors and sliders change settings values that are not part of state_key()
+        self.invalidate()
         if self.right_menu_status:
             right_menu_key = self.left_elements[self.left_menu_item].action
             if right_menu_key in self.right_elements_cache.get(self.current_menu, {}):
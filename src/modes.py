@@ -0,0 +1,66 @@
+import random
+import settings
+
+SCATTER = "scatter"
+CHASE = "chase"
+FRIGHTENED = "frightened"
+
+MODE_CYCLES = [
+    (SCATTER, 7), (CHASE, 20),
+    (SCATTER, 7), (CHASE, 20),
+    (SCATTER, 5), (CHASE, 20),
+    (SCATTER, 5), (CHASE, float('inf'))
+]
+TURN_TABLE_SIZE = 256
+
+class ModeScheduler:
+    def __init__(self, seed=0, cycles=MODE_CYCLES):
+        self.cycles = cycles
+        self.cycle_index = 0
+        self.timer = 0
+        self.mode = cycles[0][0]
+        self.frightened_timer = 0
+        self.listeners = []
+        # Frightened ghosts pick turns from a fixed pseudo-random table instead of a live RNG,
+        # so a (seed, input) pair always replays the same way
+        rng = random.Random(seed)
+        self.turn_table = [rng.randrange(4) for _ in range(TURN_TABLE_SIZE)]
+        self.turn_index = 0
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+        listener.set_mode(self.mode)
+
+    def notify(self, mode):
+        self.mode = mode
+        for listener in self.listeners:
+            listener.set_mode(mode)
+
+    def update(self, delta_time):
+        # The scatter/chase timeline is paused while ghosts are frightened
+        if self.frightened_timer > 0:
+            self.frightened_timer -= delta_time
+            if self.frightened_timer <= 0:
+                self.frightened_timer = 0
+                self.notify(self.cycles[self.cycle_index][0])
+            return
+        _, duration = self.cycles[self.cycle_index]
+        self.timer += delta_time
+        if self.timer >= duration:
+            self.timer -= duration
+            self.cycle_index = (self.cycle_index + 1) % len(self.cycles)
+            self.notify(self.cycles[self.cycle_index][0])
+
+    def frighten(self):
+        self.frightened_timer = settings.FRIGHTENED_DURATION
+        self.notify(FRIGHTENED)
+
+    def next_turn(self):
+        turn = self.turn_table[self.turn_index]
+        self.turn_index = (self.turn_index + 1) % TURN_TABLE_SIZE
+        return turn
+
+    def next_turns(self, count):
+        turns = [self.turn_table[(self.turn_index + i) % TURN_TABLE_SIZE] for i in range(count)]
+        self.turn_index = (self.turn_index + count) % TURN_TABLE_SIZE
+        return turns
@@ -0,0 +1,71 @@
+import weakref
+import numpy as np
+
+DIRECTIONS = ["up", "right", "down", "left"]
+OFFSETS = {"up": (0, -1), "right": (1, 0), "down": (0, 1), "left": (-1, 0)}
+OPPOSITE = {"up": "down", "right": "left", "down": "up", "left": "right"}
+# Ghost tie-break order when two exits are equally close to the target
+PRIORITIES = {"up": 1, "left": 2, "down": 3, "right": 4}
+HEADINGS = sorted(PRIORITIES, key=PRIORITIES.get)  # up, left, down, right
+
+# (neighbour mask, heading) -> ((dx, dy, direction), ...): the open directions of a 4-bit mask
+# (one bit per DIRECTIONS entry) without the reverse of heading, in PRIORITIES order
+EXIT_OFFSETS = {
+    (mask, heading): tuple(
+        (*OFFSETS[direction], direction) for direction in HEADINGS
+        if mask >> DIRECTIONS.index(direction) & 1 and direction != OPPOSITE[heading]
+    )
+    for mask in range(1 << len(DIRECTIONS)) for heading in DIRECTIONS
+}
+
+# Level digest -> its NavigationGraph, while any simulation on that level still holds it
+graphs = weakref.WeakValueDictionary()
+
+class NavigationGraph:
+    # A plain per-tile exit table, not a junction graph: corridors are not collapsed into edges.
+    # A corridor tile has one exit, which Ghost takes without any target maths
+    def __init__(self, walls):
+        # walls: (height, width) array, nonzero on wall tiles
+        self.height, self.width = walls.shape
+        passable = walls == 0
+        self.cells = passable.astype(np.uint8).tobytes()
+        # Passable neighbours of every tile as a 4-bit mask; out of bounds is never passable
+        padded = np.pad(passable, 1).astype(np.uint8)
+        masks = np.zeros(walls.shape, dtype=np.uint8)
+        for bit, direction in enumerate(DIRECTIONS):
+            dx, dy = OFFSETS[direction]
+            masks |= padded[1 + dy:1 + dy + self.height, 1 + dx:1 + dx + self.width] << bit
+        self.masks = masks.tobytes()
+        # (tile_x, tile_y, heading) -> ((next_x, next_y, direction), ...) without the reverse
+        # direction, sorted by PRIORITIES so the first closest exit wins ties. Filled in as
+        # ghosts reach tiles, so walls and tiles no ghost visits cost nothing
+        self.exit_table = {}
+
+    def passable(self, x, y):
+        return 0 <= y < self.height and 0 <= x < self.width and self.cells[y * self.width + x] == 1
+
+    def neighbors(self, x, y):
+        return [
+            (x + dx, y + dy, direction) for direction, (dx, dy) in OFFSETS.items()
+            if self.passable(x + dx, y + dy)
+        ]
+
+    def neighbor_mask(self, x, y):
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return self.masks[y * self.width + x]
+        # Off-grid tiles (mid-teleport) are rare and not in the precomputed masks
+        return sum(1 << bit for bit, (dx, dy) in enumerate(OFFSETS.values()) if self.passable(x + dx, y + dy))
+
+    def exits(self, x, y, heading):
+        exits = self.exit_table.get((x, y, heading))
+        if exits is None:
+            exits = tuple((x + dx, y + dy, direction) for dx, dy, direction in EXIT_OFFSETS[self.neighbor_mask(x, y), heading])
+            self.exit_table[(x, y, heading)] = exits
+        return exits
+
+def shared_graph(digest, walls):
+    # The table only depends on the walls, so simulations of the same level share one
+    graph = graphs.get(digest)
+    if graph is None:
+        graph = graphs[digest] = NavigationGraph(walls)
+    return graph
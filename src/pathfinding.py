@@ -0,0 +1,75 @@
+from array import array
+import numpy as np
+from navigation import OFFSETS
+
+UNREACHABLE = 0xFFFF
+
+class DistanceField:
+    def __init__(self, navigation):
+        self.width = navigation.width
+        self.height = navigation.height
+        cell_count = self.width * self.height
+        # Flat adjacency over cell indices (y * width + x); stepping off one edge wraps to the
+        # opposite edge, the same tunnel Player.teleport and Ghost.teleport implement
+        self.open = bytearray(navigation.cells)
+        cells = np.frombuffer(navigation.cells, dtype=np.uint8)
+        walkable = np.flatnonzero(cells)
+        ys, xs = np.divmod(walkable, self.width)
+        candidates = []
+        for dx, dy in OFFSETS.values():
+            neighbor = ((ys + dy) % self.height) * self.width + (xs + dx) % self.width
+            candidates.append(np.where(cells[neighbor] != 0, neighbor, -1).tolist())
+        self.walkable = walkable.tolist()
+        self.neighbors = [()] * cell_count
+        for index, *around in zip(self.walkable, *candidates):
+            self.neighbors[index] = tuple([neighbor for neighbor in around if neighbor >= 0])
+        self.target = None
+        self.field = None
+        self.all_pairs = None
+        self.searches = 0
+
+    def cell(self, tile):
+        x, y = tile
+        index = (y % self.height) * self.width + x % self.width
+        return index if self.open[index] else None
+
+    def search(self, source):
+        self.searches += 1
+        field = array('H', [UNREACHABLE]) * (self.width * self.height)
+        field[source] = 0
+        frontier = [source]
+        distance = 0
+        neighbors = self.neighbors
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for index in frontier:
+                for neighbor in neighbors[index]:
+                    if field[neighbor] == UNREACHABLE:
+                        field[neighbor] = distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return field
+
+    def all_pairs_bytes(self):
+        # Every row covers the whole grid, walls included, so sparse maps cost far more than
+        # their walkable tile count suggests
+        return len(self.walkable) * self.width * self.height * array('H').itemsize
+
+    def precompute(self):
+        # All-pairs table, one field per walkable tile; the maze is undirected so
+        # distances_to() can hand out rows without searching again
+        self.all_pairs = {source: self.search(source) for source in self.walkable}
+
+    def distances_to(self, tile):
+        # Shared by every ghost; only recomputed when the target moves to another tile
+        if tile != self.target:
+            self.target = tile
+            source = self.cell(tile)
+            if source is None:
+                self.field = None
+            elif self.all_pairs is not None:
+                self.field = self.all_pairs[source]
+            else:
+                self.field = self.search(source)
+        return self.field
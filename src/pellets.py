@@ -0,0 +1,63 @@
+import settings
+
+PELLET = 1
+POWER_PELLET = 2
+PELLET_TILES = {'.': PELLET, '*': POWER_PELLET}
+PELLET_POINTS = {PELLET: settings.PELLET_SCORE, POWER_PELLET: settings.POWER_PELLET_SCORE}
+
+def pellet_width(kind, tile_size):
+    return tile_size // 2 if kind == POWER_PELLET else tile_size // 5
+
+class Pellets:
+    def __init__(self, kinds, tile_size=None):
+        # kinds: the level's (height, width) pellet plane, a PELLET_TILES value or 0 per tile
+        self.tile_size = tile_size or settings.TILE_SIZE
+        self.height, self.width = kinds.shape
+        self.cells = bytearray(kinds.tobytes())
+        self.initial = bytes(self.cells)  # Pellets at the start, for restoring saved states
+        self.total = self.width * self.height - self.cells.count(0)
+        self.remaining = self.total
+        self.eaten = []  # Tiles eaten since the last drain_eaten(), for renderers
+
+    def kind_at(self, tile_x, tile_y):
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.cells[tile_y * self.width + tile_x]
+        return 0
+
+    def tiles(self):
+        for index, kind in enumerate(self.cells):
+            if kind:
+                yield index % self.width, index // self.width, kind
+
+    def collide(self, rect):
+        # Only pellets in the (at most 2x2) tiles under rect can overlap it; test them
+        # in row-major order against the pellet's own centered square
+        size = self.tile_size
+        for tile_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for tile_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                kind = self.kind_at(tile_x, tile_y)
+                if kind:
+                    width = pellet_width(kind, size)
+                    left = tile_x * size + size // 2 - width // 2
+                    top = tile_y * size + size // 2 - width // 2
+                    if rect.left < left + width and left < rect.right and rect.top < top + width and top < rect.bottom:
+                        return tile_x, tile_y
+        return None
+
+    def eat(self, rect):
+        tile = self.collide(rect)
+        if tile is None:
+            return 0
+        return self.remove(*tile)
+
+    def remove(self, tile_x, tile_y):
+        index = tile_y * self.width + tile_x
+        kind = self.cells[index]
+        self.cells[index] = 0
+        self.remaining -= 1
+        self.eaten.append((tile_x, tile_y))
+        return kind
+
+    def drain_eaten(self):
+        eaten, self.eaten = self.eaten, []
+        return eaten
@@ -0,0 +1,58 @@
+import random
+from collections import deque
+from navigation import DIRECTIONS
+
+class IdlePolicy:
+    # Never touches the controls; the player keeps its starting direction
+    def __init__(self, seed=0):
+        pass
+
+    def __call__(self, simulation):
+        return None
+
+class RandomPolicy:
+    # Held directions with an occasional random turn, like a distracted human
+    def __init__(self, seed=0, turn_chance=0.03):
+        self.rng = random.Random(seed)
+        self.turn_chance = turn_chance
+        self.direction = "left"
+
+    def __call__(self, simulation):
+        if self.rng.random() < self.turn_chance:
+            self.direction = self.rng.choice(DIRECTIONS)
+        return self.direction
+
+class GreedyPolicy:
+    # Heads for the nearest pellet by maze distance, ignoring the ghosts
+    def __init__(self, seed=0):
+        self.tile = None
+        self.direction = None
+
+    def __call__(self, simulation):
+        tile = simulation.player_tile()
+        if tile != self.tile:
+            # Only re-planned on entering a new tile; the search stops at the first pellet
+            self.tile = tile
+            self.direction = self.nearest_pellet(simulation, tile)
+        return self.direction
+
+    def nearest_pellet(self, simulation, start):
+        navigation, pellets = simulation.navigation, simulation.pellets
+        first_steps = {start: None}
+        frontier = deque([start])
+        while frontier:
+            x, y = frontier.popleft()
+            if pellets.kind_at(x, y) and (x, y) != start:
+                return first_steps[(x, y)]
+            for next_x, next_y, direction in navigation.neighbors(x, y):
+                if (next_x, next_y) not in first_steps:
+                    first_steps[(next_x, next_y)] = first_steps[(x, y)] or direction
+                    frontier.append((next_x, next_y))
+        return None
+
+POLICIES = {"idle": IdlePolicy, "random": RandomPolicy, "greedy": GreedyPolicy}
+
+def create_policy(name, seed=0):
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy {name!r}, expected one of {', '.join(sorted(POLICIES))}")
+    return POLICIES[name](seed)
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from collections import deque
+import pygame
+import settings
+
+class NullSpan:
+    # Shared do-nothing context handed out while profiling is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+def percentile(ordered, fraction):
+    # Nearest rank on an already sorted list
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Profiler:
+    def __init__(self, enabled=False, history=240, trace_events=100000):
+        self.enabled = enabled
+        self.overlay = False
+        self.history = history
+        self.samples = {}  # phase -> deque of the latest durations in ms, in first-seen order
+        self.events = deque(maxlen=trace_events)  # (name, start ns, duration ns, thread id) for export
+        self.counters = {}  # name -> running total, e.g. blits; read and cleared by take_counters()
+        self.origin = time.perf_counter_ns()
+        self.lines = []
+        self.refreshed = 0
+        # The simulation thread records too; readers copy what they need while holding this
+        self.lock = threading.Lock()
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, start, duration):
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.history)
+            samples.append(duration / 1e6)
+            self.events.append((name, start, duration, threading.get_ident()))
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def take_counters(self):
+        with self.lock:
+            counters, self.counters = self.counters, {}
+        return counters
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.enabled = True
+        else:
+            self.enabled = settings.PROFILER
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.events.clear()
+            self.counters.clear()
+        self.lines = []
+
+    def names(self):
+        with self.lock:
+            return list(self.samples)
+
+    def percentiles(self, name):
+        with self.lock:
+            ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return 0, 0, 0
+        return percentile(ordered, 0.5), percentile(ordered, 0.95), percentile(ordered, 0.99)
+
+    def summary(self):
+        return {name: dict(zip(("p50", "p95", "p99"), self.percentiles(name))) for name in self.names()}
+
+    def export(self, path):
+        # Chrome trace format (chrome://tracing, Perfetto): complete events in microseconds
+        with self.lock:
+            recorded = list(self.events)
+        threads = {}
+        events = [
+            {
+                "name": name, "ph": "X", "pid": 0, "tid": threads.setdefault(thread, len(threads)),
+                "ts": (start - self.origin) / 1e3, "dur": duration / 1e3,
+            }
+            for name, start, duration, thread in recorded
+        ]
+        with open(path, 'w') as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
+
+    def draw_overlay(self, surface, font, position):
+        now = time.perf_counter()
+        if now - self.refreshed >= settings.PROFILER_REFRESH:
+            # Re-rendered a few times a second, not every frame, and kept out of the shared text cache
+            self.lines = [font.render(f"{'ms':<14}{'p50':>6}{'p95':>7}{'p99':>7}", settings.WHITE, size=8)[0]]
+            for name in self.names():
+                p50, p95, p99 = self.percentiles(name)
+                self.lines.append(font.render(f"{name:<14}{p50:>6.2f}{p95:>7.2f}{p99:>7.2f}", settings.WHITE, size=8)[0])
+            self.refreshed = now
+        x, y = position
+        width = max([line.get_width() for line in self.lines] + [settings.PROFILER_HISTORY])
+        pygame.draw.rect(surface, settings.MENU_BG_COLOR, (x - 4, y - 4, width + 8, len(self.lines) * 12 + 80))
+        for line in self.lines:
+            surface.blit(line, (x, y))
+            y += 12
+        self.draw_graph(surface, pygame.Rect(x, y + 8, settings.PROFILER_HISTORY, 60))
+
+    def draw_graph(self, surface, rect):
+        # Frame times as bars against the frame budget, scaled so twice the budget fills the box
+        budget = 1000 / settings.FPS
+        with self.lock:
+            frame_times = list(self.samples.get("frame", ()))
+        for index, frame_time in enumerate(frame_times):
+            height = min(rect.height, int(frame_time / (2 * budget) * rect.height))
+            color = settings.WALL_COLOR if frame_time <= budget else settings.SCORE_COLOR
+            pygame.draw.line(surface, color, (rect.x + index, rect.bottom - 1), (rect.x + index, rect.bottom - height))
+        budget_y = rect.bottom - rect.height // 2
+        pygame.draw.line(surface, settings.WHITE, (rect.x, budget_y), (rect.right - 1, budget_y))
+
+profiler = Profiler(settings.PROFILER, settings.PROFILER_HISTORY, settings.PROFILER_TRACE_EVENTS)
@@ -0,0 +1,39 @@
+import pygame
+
+class DirtyRects:
+    def __init__(self):
+        self.rects = []
+        self.full = True  # The next present() flips the whole screen
+        self.pixels_pushed = 0  # Last frame
+        self.total_pixels = 0
+        self.frames = 0
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rect):
+        self.rects.append(rect)
+
+    def present(self, screen):
+        if self.full:
+            pygame.display.flip()
+            pixels = screen.get_width() * screen.get_height()
+        else:
+            bounds = screen.get_rect()
+            rects = [rect.clip(bounds) for rect in self.rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            if rects:
+                pygame.display.update(rects)
+            pixels = sum(rect.width * rect.height for rect in rects)
+        self.full = False
+        self.rects = []
+        self.pixels_pushed = pixels
+        self.total_pixels += pixels
+        self.frames += 1
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "pixels_pushed": self.pixels_pushed,
+            "pixels_per_frame": self.total_pixels / self.frames if self.frames else 0,
+        }
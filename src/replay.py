@@ -0,0 +1,104 @@
+import struct
+import zlib
+import settings
+from navigation import HEADINGS
+from level_compiler import level_hash
+from simulation import Simulation
+
+MAGIC = b"PACRPL02"
+# magic, simulation seed, level sha1, tick rate, chase metric, batched ghosts, tick count,
+# checksum of the final state
+HEADER = struct.Struct("<8sQ20sHB?II")
+RUN = struct.Struct("<BH")  # direction code, ticks held
+MAX_RUN = 0xFFFF
+DIRECTIONS = [None] + HEADINGS
+CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+CHASE_METRICS = ["euclidean", "maze"]  # settings.GHOST_CHASE_METRIC values
+
+def state_checksum(simulation):
+    # Cheap fingerprint of where everything ended up, to catch a desynced playback
+    simulation.sync_ghosts()
+    state = (simulation.tick, simulation.player.score, tuple(simulation.player.rect), tuple(tuple(ghost.rect) for ghost in simulation.ghosts))
+    return zlib.crc32(repr(state).encode())
+
+class InputRecorder:
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.level_hash = level_hash(simulation.level_file)
+        self.runs = []  # [code, ticks], run-length encoded: held directions repeat for hundreds of ticks
+        self.ticks = 0
+
+    def record(self, direction):
+        code = CODES[direction]
+        if self.runs and self.runs[-1][0] == code and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([code, 1])
+        self.ticks += 1
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(
+                MAGIC, self.simulation.seed, self.level_hash, settings.TICK_RATE,
+                CHASE_METRICS.index(settings.GHOST_CHASE_METRIC), self.simulation.batched_ghosts,
+                self.ticks, state_checksum(self.simulation)
+            ))
+            file.write(b"".join(RUN.pack(code, ticks) for code, ticks in self.runs))
+
+class Replay:
+    def __init__(self, seed, level_hash, tick_rate, chase_metric, batched_ghosts, ticks, checksum, runs):
+        self.seed = seed
+        self.level_hash = level_hash
+        self.tick_rate = tick_rate
+        self.chase_metric = chase_metric
+        self.batched_ghosts = batched_ghosts
+        self.ticks = ticks
+        self.checksum = checksum
+        self.runs = runs
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        _, seed, digest, tick_rate, metric, batched_ghosts, ticks, checksum = HEADER.unpack_from(data)
+        if metric >= len(CHASE_METRICS):
+            raise ValueError(f"{path} uses an unknown ghost chase metric")
+        body = data[HEADER.size:]
+        if len(body) % RUN.size:
+            raise ValueError(f"{path} is truncated")
+        runs = list(RUN.iter_unpack(body))
+        if sum(count for _, count in runs) != ticks:
+            raise ValueError(f"{path} is truncated")
+        return cls(seed, digest, tick_rate, CHASE_METRICS[metric], batched_ghosts, ticks, checksum, runs)
+
+    def directions(self):
+        for code, ticks in self.runs:
+            direction = DIRECTIONS[code]
+            for _ in range(ticks):
+                yield direction
+
+    def check(self, level_file, batched_ghosts):
+        # Anything that changes how a tick plays out has to match, or playback only fails at the checksum
+        if level_hash(level_file) != self.level_hash:
+            raise ValueError(f"replay was recorded on a different version of {level_file}")
+        if self.tick_rate != settings.TICK_RATE:
+            raise ValueError(f"replay was recorded at {self.tick_rate} ticks per second, not {settings.TICK_RATE}")
+        if self.chase_metric != settings.GHOST_CHASE_METRIC:
+            raise ValueError(f"replay was recorded with GHOST_CHASE_METRIC = {self.chase_metric!r}, not {settings.GHOST_CHASE_METRIC!r}")
+        if self.batched_ghosts != batched_ghosts:
+            raise ValueError(f"replay was recorded with BATCHED_GHOSTS = {self.batched_ghosts}, not {batched_ghosts}")
+
+    def simulation(self, level_file=None, headless=True, batched_ghosts=None):
+        level_file = level_file or settings.LEVEL_FILE
+        if batched_ghosts is None:
+            batched_ghosts = settings.BATCHED_GHOSTS
+        self.check(level_file, batched_ghosts)
+        return Simulation(level_file, headless, batched_ghosts, seed=self.seed)
+
+    def run(self, simulation):
+        # Fast-forward: every tick back to back, no clock and no rendering
+        for direction in self.directions():
+            simulation.step(direction)
+        return state_checksum(simulation) == self.checksum
@@ -0,0 +1,137 @@
+import struct
+import zlib
+from array import array
+from collections import deque
+import numpy as np
+from navigation import HEADINGS
+from swarm import MODES
+
+# tick, dead, death tile (x, y), scheduler cycle index, timer, mode, frightened timer, turn index,
+# player x, y, direction, desired direction, score, ghost count
+STATE = struct.Struct("<I?hhHdBdIiiBBIH")
+GHOST = np.dtype([("x", "<i4"), ("y", "<i4"), ("direction", "u1"), ("mode", "u1")])
+CODES = {heading: code for code, heading in enumerate(HEADINGS)}
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+RAW_DEFLATE = -15  # zlib wbits: no header or checksum, which would cost 6 of the ~40 bytes a delta takes
+
+def save_state(simulation):
+    # Everything step() reads that is not derived from the level, seed or settings. Targets and
+    # velocities are recomputed at the start of every update and animation frames follow from
+    # the tick, so they are left out
+    player = simulation.player
+    scheduler = simulation.mode_scheduler
+    swarm = simulation.ghost_swarm
+    if swarm:
+        ghosts = np.empty(len(swarm), dtype=GHOST)
+        ghosts["x"], ghosts["y"], ghosts["direction"], ghosts["mode"] = swarm.x, swarm.y, swarm.headings, swarm.modes
+    else:
+        ghosts = np.array([
+            (ghost.rect.x, ghost.rect.y, CODES[ghost.direction], MODE_CODES[ghost.mode]) for ghost in simulation.ghosts
+        ], dtype=GHOST)
+    death_x, death_y = simulation.death_tile or (-1, -1)
+    header = STATE.pack(
+        simulation.tick, simulation.dead, death_x, death_y,
+        scheduler.cycle_index, scheduler.timer, MODE_CODES[scheduler.mode], scheduler.frightened_timer, scheduler.turn_index,
+        player.rect.x, player.rect.y, CODES[player.direction], CODES[player.desired_direction],
+        player.score, len(ghosts)
+    )
+    # One bit per tile: is the pellet the level started with still there
+    pellets = np.packbits(np.frombuffer(simulation.pellets.cells, dtype=np.uint8) != 0)
+    return header + ghosts.tobytes() + pellets.tobytes()
+
+def load_state(simulation, data):
+    (
+        simulation.tick, simulation.dead, death_x, death_y,
+        cycle_index, timer, mode, frightened_timer, turn_index,
+        x, y, direction, desired_direction, score, ghost_count
+    ) = STATE.unpack_from(data)
+    simulation.death_tile = (death_x, death_y) if death_x >= 0 else None
+    scheduler = simulation.mode_scheduler
+    scheduler.cycle_index, scheduler.timer, scheduler.mode = cycle_index, timer, MODES[mode]
+    scheduler.frightened_timer, scheduler.turn_index = frightened_timer, turn_index
+
+    player = simulation.player
+    player.rect.topleft = (x, y)
+    player.direction, player.desired_direction = HEADINGS[direction], HEADINGS[desired_direction]
+    player.score = score
+
+    if ghost_count != len(simulation.ghosts):
+        raise ValueError(f"state has {ghost_count} ghosts, the simulation has {len(simulation.ghosts)}")
+    ghosts = np.frombuffer(data, dtype=GHOST, count=ghost_count, offset=STATE.size)
+    swarm = simulation.ghost_swarm
+    if swarm:
+        swarm.x, swarm.y = ghosts["x"].astype(np.int64), ghosts["y"].astype(np.int64)
+        swarm.headings, swarm.modes = ghosts["direction"].astype(np.int64), ghosts["mode"].astype(np.int8)
+    else:
+        for ghost, (x, y, direction, mode) in zip(simulation.ghosts, ghosts.tolist()):
+            ghost.rect.topleft = (x, y)
+            ghost.direction, ghost.mode = HEADINGS[direction], MODES[mode]
+
+    pellets = simulation.pellets
+    kept = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=STATE.size + ghost_count * GHOST.itemsize), count=len(pellets.cells))
+    cells = np.frombuffer(pellets.initial, dtype=np.uint8) * kept
+    pellets.cells[:] = cells.tobytes()
+    pellets.remaining = int(np.count_nonzero(cells))
+
+def xor(data, reference):
+    # Consecutive states share almost every byte, so the XOR is nearly all zeros
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(reference, 'little')).to_bytes(len(data), 'little')
+
+class RewindBuffer:
+    # Newest states within a fixed byte budget. States are stored in groups: a keyframe, then
+    # deltas that each XOR against that keyframe and are deflated, so any state decodes
+    # from two entries. The oldest whole group is dropped when the budget runs out
+    def __init__(self, max_bytes, keyframe_interval=60):
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        # [keyframe, deltas back to back, end offset of each delta]: one bytearray per group
+        # instead of a bytes object per tick, which would more than double the memory used
+        self.groups = deque()
+        self.size = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, state):
+        group = self.groups[-1] if self.groups else None
+        if group is None or len(group[2]) + 1 >= self.keyframe_interval or len(state) != len(group[0]):
+            group = [state, bytearray(), array('I')]
+            self.groups.append(group)
+            self.size += len(state)
+        else:
+            delta = zlib.compress(xor(state, group[0]), 9, RAW_DEFLATE)
+            group[1] += delta
+            group[2].append(len(group[1]))
+            self.size += len(delta) + group[2].itemsize
+        self.count += 1
+        while self.size > self.max_bytes and len(self.groups) > 1:
+            keyframe, deltas, ends = self.groups.popleft()
+            self.size -= len(keyframe) + len(deltas) + len(ends) * ends.itemsize
+            self.count -= 1 + len(ends)
+
+    def latest(self):
+        keyframe, deltas, ends = self.groups[-1]
+        if not ends:
+            return keyframe
+        start = ends[-2] if len(ends) > 1 else 0
+        return xor(zlib.decompress(deltas[start:], RAW_DEFLATE), keyframe)
+
+    def pop(self):
+        state = self.latest()
+        keyframe, deltas, ends = self.groups[-1]
+        if ends:
+            start = ends[-2] if len(ends) > 1 else 0
+            self.size -= len(deltas) - start + ends.itemsize
+            del deltas[start:]
+            ends.pop()
+        else:
+            self.groups.pop()
+            self.size -= len(keyframe)
+        self.count -= 1
+        return state
+
+    def clear(self):
+        self.groups.clear()
+        self.size = 0
+        self.count = 0
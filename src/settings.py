@@ -3,8 +3,51 @@ GAME_WIDTH = TILE_SIZE * 28
 GAME_HEIGHT = TILE_SIZE * 36
 FPS = 60
 
+# Simulation
+TICK_RATE = 60
+MAX_FRAME_TIME = 0.25
+IDLE_MODE = True  # Block on the event queue in menus and pause instead of ticking at FPS
+IDLE_TIMEOUT = 1000  # ms
+THREADED_SIMULATION = False  # Tick on a separate thread and draw interpolated snapshots of it
+
+# Ghost AI
+GHOST_CHASE_METRIC = "euclidean"  # "euclidean" (classic straight-line) or "maze" (shared BFS distance field)
+BATCHED_GHOSTS = False  # Move ghosts with the NumPy GhostSwarm, worthwhile from a few hundred ghosts
+ALL_PAIRS_MAX_BYTES = 4 * 1024 * 1024  # Precompute all-pairs maze distances when the table fits in this
+FRIGHTENED_DURATION = 6  # Seconds after a power pellet
+GHOST_SPEED = 150
+FRIGHTENED_SPEED = 75
+
+# Rendering
+TEXT_CACHE_SIZE = 256
+MENU_FRAME_CACHE_SIZE = 8
+PAUSE_BACKDROP_DIM = 200  # Alpha of the menu color over the frozen game, 0 to disable
+PAUSE_BACKDROP_BLUR = 4  # Downscale factor for the backdrop blur, 1 to disable
+CHUNK_TILES = 16  # Maze and pellet layers are rendered in square chunks of this many tiles
+CHUNK_CACHE_SIZE = 64  # Rendered chunks kept per layer; must cover one screen of chunks
+DIRTY_RECTS = True  # Push only the areas that changed during gameplay instead of flipping the whole screen
+DIRTY_RECTS_MAX_SPRITES = 96  # Break-even against a full redraw is around 100 on level-1
+
+# Profiling
+PROFILER = False  # Record phase timings from startup; F3 shows the overlay (and records) at runtime
+PROFILER_HISTORY = 240  # Frames kept for percentiles and the frame graph
+PROFILER_TRACE_EVENTS = 100000  # Newest spans kept for the trace export
+PROFILER_REFRESH = 0.5  # Seconds between overlay text updates
+PROFILER_TRACE_FILE = 'profile_trace.json'  # Written with F4
+
+# Rewind
+REWIND = False  # Keep recent states and scrub back through them while Backspace is held (QA)
+REWIND_MEMORY = 4 * 1024 * 1024  # Bytes of compressed states, about 25 minutes on level-1
+REWIND_KEYFRAME_INTERVAL = 60  # Ticks between uncompressed keyframes
+REWIND_SPEED = 2  # Ticks rewound per tick while scrubbing
+
+# Scoring
+PELLET_SCORE = 1
+POWER_PELLET_SCORE = 5
+
 # Levels
 LEVEL_FILE = 'levels/level-1.txt'
+LEVEL_CACHE_DIR = 'levels/cache'
 
 # Colors
 BLACK = (0, 0, 0)
@@ -0,0 +1,126 @@
+import numpy as np
+import pygame
+from sprites.player import Player
+import settings
+from level import load_level
+from collision import CollisionGrid
+from pellets import Pellets, POWER_PELLET
+from navigation import shared_graph
+from pathfinding import DistanceField
+from swarm import GhostSwarm
+from modes import ModeScheduler, FRIGHTENED
+from profiler import profiler
+
+class Simulation:
+    def __init__(self, level_file=None, headless=True, batched_ghosts=False, seed=0):
+        self.level_file = level_file or settings.LEVEL_FILE
+        self.headless = headless
+        self.batched_ghosts = batched_ghosts
+        self.seed = seed
+        self.delta_time = 1 / settings.TICK_RATE
+        self.recorder = None  # replay.InputRecorder, fed the held direction of every tick
+        self.end_on_death = False  # Stop stepping once a ghost catches the player
+        self.load()
+        self.reset()
+
+    def load(self):
+        # Everything that only depends on the level file, kept across reset()
+        compiled, self.player_x, self.player_y, self.ghost_spawns = load_level(self.level_file, settings.TILE_SIZE)
+        self.level = compiled.rows()
+        # Copies of the planes: recompiling the level closes the map they come from
+        self.tiles = np.array(compiled.tiles)
+        self.wall_shapes = np.array(compiled.shapes)
+        self.pellet_kinds = np.array(compiled.pellets)
+        self.walls = compiled.walls()
+        self.collision_grid = CollisionGrid(self.walls)
+        self.navigation = shared_graph(compiled.digest, self.walls)
+        self.distance_field = DistanceField(self.navigation)
+        if settings.GHOST_CHASE_METRIC == "maze" and self.distance_field.all_pairs_bytes() <= settings.ALL_PAIRS_MAX_BYTES:
+            self.distance_field.precompute()
+
+    def reset(self, seed=None):
+        # A fresh game on the loaded level, optionally with another seed
+        if seed is not None:
+            self.seed = seed
+        self.ghosts = pygame.sprite.Group()
+        self.pellets = Pellets(self.pellet_kinds)
+        self.player = Player(self.player_x, self.player_y, self.headless)
+        self.mode_scheduler = ModeScheduler(self.seed)
+        self.ghost_swarm = None
+        for ghost_class, x, y in self.ghost_spawns:
+            self.add_ghost(ghost_class(x, y, self.headless))
+        self.tick = 0
+        self.dead = False
+        self.death_tile = None
+
+    def add_ghost(self, ghost):
+        self.ghosts.add(ghost)
+        self.mode_scheduler.subscribe(ghost)
+        if self.ghost_swarm:
+            # Rebuilt lazily on the next step so adding many ghosts stays cheap
+            self.ghost_swarm.write_back(self.ghosts)
+            self.ghost_swarm = None
+
+    @property
+    def time(self):
+        # Game time in seconds; what animations are played against
+        return self.tick / settings.TICK_RATE
+
+    def player_tile(self):
+        return (
+            self.player.rect.center[0] // settings.TILE_SIZE,
+            self.player.rect.center[1] // settings.TILE_SIZE
+        )
+
+    def step(self, direction=None):
+        if self.dead:
+            return
+        if direction:
+            self.player.desired_direction = direction
+        if self.recorder:
+            self.recorder.record(self.player.desired_direction)
+        with profiler.phase("update.player"):
+            self.player.update(self.level, self.collision_grid, self.pellets, self.delta_time)
+        with profiler.phase("update.ghosts"):
+            if self.player.last_eaten == POWER_PELLET:
+                self.mode_scheduler.frighten()
+            self.mode_scheduler.update(self.delta_time)
+            player_tile = self.player_tile()
+            field = self.distance_field.distances_to(player_tile) if settings.GHOST_CHASE_METRIC == "maze" else None
+            if self.batched_ghosts:
+                self.batch_ghosts().update(self.delta_time, player_tile, field, self.mode_scheduler)
+            else:
+                self.ghosts.update(self.navigation, self.collision_grid, self.delta_time, player_tile, field, self.mode_scheduler)
+        self.tick += 1
+        if self.end_on_death and self.caught(self.player_tile()):
+            self.dead = True
+            self.death_tile = self.player_tile()
+
+    def caught(self, tile):
+        # A ghost that is not frightened sharing the player's tile; frightened ghosts are harmless
+        if self.ghost_swarm:
+            return self.ghost_swarm.caught(tile)
+        size = settings.TILE_SIZE
+        return any(
+            ghost.mode != FRIGHTENED and (ghost.rect.centerx // size, ghost.rect.centery // size) == tile
+            for ghost in self.ghosts
+        )
+
+    def batch_ghosts(self):
+        if self.ghost_swarm is None:
+            self.ghost_swarm = GhostSwarm.from_ghosts(self.ghosts, self.navigation, self.collision_grid)
+            # The swarm replaces the sprites as the scheduler's listener
+            self.mode_scheduler.listeners = [self.ghost_swarm]
+        return self.ghost_swarm
+
+    def sync_ghosts(self):
+        # Batched ghosts live in arrays; copy them onto the sprites before drawing
+        if self.ghost_swarm:
+            self.ghost_swarm.write_back(self.ghosts)
+
+    def run(self, ticks, policy=None):
+        # Uncapped: no clock, no display, just fixed steps
+        for _ in range(ticks):
+            if self.dead:
+                break
+            self.step(policy(self) if policy else None)
@@ -0,0 +1,120 @@
+import threading
+import time
+import numpy as np
+import settings
+from navigation import HEADINGS
+from profiler import profiler
+from swarm import MODES
+
+class Snapshot:
+    # Everything the renderer needs from one tick, copied out as tuples and never changed again;
+    # animation frames follow from the tick, so they are not copied
+    def __init__(self, simulation, input_time):
+        player = simulation.player
+        self.tick = simulation.tick
+        self.time = time.perf_counter()
+        self.input_time = input_time  # When the direction this tick used was handed in
+        self.score = player.score
+        self.player = (player.rect.x, player.rect.y, player.direction)
+        swarm = simulation.batch_ghosts() if simulation.batched_ghosts else None
+        if swarm:
+            # Copies of the swarm's arrays; writing them back onto sprites every tick would cost
+            # most of what batching saves, so only the frames that get drawn pay for it in show()
+            self.ghosts = None
+            self.swarm = (swarm.x.copy(), swarm.y.copy(), swarm.headings.copy(), swarm.modes.copy())
+        else:
+            self.ghosts = tuple((ghost.rect.x, ghost.rect.y, ghost.direction, ghost.mode) for ghost in simulation.ghosts)
+            self.swarm = None
+        self.eaten = len(simulation.pellets.eaten)  # Length of the simulation's append-only eaten log
+
+def interpolate(start, end, alpha):
+    # Wrapping through a tunnel jumps across the map; show that as a jump, not a slide
+    if abs(end - start) > settings.TILE_SIZE:
+        return end
+    return round(start + (end - start) * alpha)
+
+def interpolate_array(start, end, alpha):
+    # interpolate() over every batched ghost; np.rint rounds half to even like round()
+    return np.where(np.abs(end - start) > settings.TILE_SIZE, end, np.rint(start + (end - start) * alpha)).astype(np.int64)
+
+class SimulationThread:
+    # Runs a Simulation at TICK_RATE on its own thread. Each tick publishes a Snapshot into a
+    # (previous, latest) pair that is swapped in with one assignment, so the render thread always
+    # reads two consistent ticks and never touches the live simulation's sprites
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.delta_time = simulation.delta_time
+        self.input = (None, 0)  # (held direction, when it was handed in), replaced as a whole
+        first = Snapshot(simulation, 0)
+        self.snapshots = (first, first)
+        self.shown = first
+        self.eaten_shown = 0
+        self.active = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopping = True
+        self.active.set()
+        self.thread.join()
+
+    def set_active(self, active):
+        # Menus and pause freeze the simulation the same way they skip Game.update
+        if active != self.active.is_set():
+            if active:
+                self.active.set()
+            else:
+                self.active.clear()
+
+    def set_input(self, direction):
+        if direction != self.input[0]:
+            self.input = (direction, time.perf_counter())
+
+    def run(self):
+        next_tick = None
+        while not self.stopping:
+            if not self.active.wait(0.1):
+                next_tick = None
+                continue
+            now = time.perf_counter()
+            if next_tick is None or now - next_tick > settings.MAX_FRAME_TIME:
+                # Resumed or fell far behind: start counting from now rather than catching up
+                next_tick = now
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+            direction, input_time = self.input
+            with profiler.phase("simulation"):
+                self.simulation.step(direction)
+                snapshot = Snapshot(self.simulation, input_time)
+            self.snapshots = (self.snapshots[1], snapshot)
+            next_tick += self.delta_time
+
+    def show(self, mirror):
+        # Copy the state one tick behind the latest, blended towards it by the time since it arrived,
+        # onto the main thread's own sprites; the drawing code never knows the difference
+        previous, latest = self.snapshots
+        alpha = min(1.0, (time.perf_counter() - latest.time) / self.delta_time)
+        player = mirror.player
+        x, y, player.direction = latest.player
+        player.rect.topleft = (interpolate(previous.player[0], x, alpha), interpolate(previous.player[1], y, alpha))
+        player.score = latest.score
+        if latest.swarm:
+            x, y, headings, modes = latest.swarm
+            before = previous.swarm or latest.swarm
+            xs, ys = interpolate_array(before[0], x, alpha), interpolate_array(before[1], y, alpha)
+            for ghost, x, y, heading, mode in zip(mirror.ghosts, xs.tolist(), ys.tolist(), headings.tolist(), modes.tolist()):
+                ghost.rect.topleft = (x, y)
+                ghost.direction, ghost.mode = HEADINGS[heading], MODES[mode]
+        else:
+            for ghost, before, (x, y, ghost.direction, ghost.mode) in zip(mirror.ghosts, previous.ghosts, latest.ghosts):
+                ghost.rect.topleft = (interpolate(before[0], x, alpha), interpolate(before[1], y, alpha))
+        eaten = self.simulation.pellets.eaten
+        for tile in eaten[self.eaten_shown:latest.eaten]:
+            mirror.pellets.remove(*tile)
+        self.eaten_shown = latest.eaten
+        mirror.tick = latest.tick
+        self.shown = latest
@@ -1,102 +1,93 @@
 import pygame
 import os
-from settings import TILE_SIZE
+from settings import TILE_SIZE, GHOST_SPEED, FRIGHTENED_SPEED
+from asset_manager import assets
+from navigation import HEADINGS, OPPOSITE
+from modes import SCATTER, CHASE, FRIGHTENED
+from animation import STILL
 
 class Ghost(pygame.sprite.Sprite):
     SCALE = 1.25
 
-    def __init__(self, x, y, ghost_name, scatter_target):
+    def __init__(self, x, y, ghost_name, scatter_target, headless=False):
         super().__init__()
         self.direction = "left"
-        self.load_images(ghost_name)
+        self.frames = {}  # direction -> animation frames, ready for per-direction eye sprites
+        self.frightened_frames = []
+        self.animation = STILL  # One image per direction until there is art for more
+        self.animation_start = 0
+        self.image = None
+        if not headless:
+            self.load_images(ghost_name)
         self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        self.move_speed = 150
+        self.move_speed = GHOST_SPEED
         self.velocity = pygame.Vector2(0, 0)
         self.scatter_target = scatter_target
         self.target = scatter_target
-        self.mode = "scatter"
-        self.timer = 0
-        self.cycle_index = 0
-        self.cycles = [
-            ("scatter", 7), ("chase", 20),
-            ("scatter", 7), ("chase", 20),
-            ("scatter", 5), ("chase", 20),
-            ("scatter", 5), ("chase", float('inf'))
-        ]
+        self.mode = SCATTER  # Pushed by the level's ModeScheduler on every transition
 
     def load_images(self, name):
         base_path = "assets/images/ghosts"
         size = (TILE_SIZE * self.SCALE, TILE_SIZE * self.SCALE)
         image_path = os.path.join(base_path, f"{name}.png")
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, size)
+        self.frames = {direction: [assets.image(image_path, size)] for direction in ("up", "right", "down", "left")}
+        self.frightened_frames = [assets.image(os.path.join(base_path, "blue_ghost.png"), size)]
+        self.image = self.frames[self.direction][0]
 
-    def update(self, level, walls, delta_time, player_pos):
-        self.timer += delta_time
-        self.update_mode(player_pos)
+    def update(self, navigation, collision_grid, delta_time, player_pos, distance_field=None, mode_scheduler=None):
+        self.update_target(player_pos)
 
         ghost_x, ghost_y = self.rect.center
         tile_x, tile_y = ghost_x // TILE_SIZE, ghost_y // TILE_SIZE
 
-        self.find_closest_neighbor(ghost_x, ghost_y, level, self.target)
+        self.find_closest_neighbor(ghost_x, ghost_y, navigation, self.target, distance_field if self.mode == CHASE else None, mode_scheduler)
         self.calculate_movement()
 
         if self.velocity.length() > 0:
-            self.move(self.velocity * delta_time, walls)
-
-        self.teleport(tile_x, tile_y, len(level[0]), len(level))
-
-    def update_mode(self, player_pos):
-        mode, duration = self.cycles[self.cycle_index]
-        if self.timer >= duration:
-            self.timer -= duration
-            self.cycle_index = (self.cycle_index + 1) % len(self.cycles)
-            self.mode, _ = self.cycles[self.cycle_index]
-        # Update target based on mode
-        if self.mode == "scatter":
+            self.move(self.velocity * delta_time, collision_grid)
+
+        self.teleport(tile_x, tile_y, navigation.width, navigation.height)
+
+    def set_mode(self, mode):
+        # Entering frightened mode turns the ghost around, as in the arcade game
+        if mode == FRIGHTENED and self.mode != FRIGHTENED:
+            self.direction = OPPOSITE[self.direction]
+        self.mode = mode
+
+    def update_target(self, player_pos):
+        if self.mode == SCATTER:
             self.target = self.scatter_target
-        elif self.mode == "chase":
+        elif self.mode == CHASE:
             self.target = player_pos
 
-    def find_closest_neighbor(self, x, y, level, target):
+    def find_closest_neighbor(self, x, y, navigation, target, distance_field=None, mode_scheduler=None):
         tile_x = x // TILE_SIZE
         tile_y = y // TILE_SIZE
-        wall_values = {'1', '2'}
-
-        neighbors = [
-            (tile_x, tile_y - 1, "up"),    # Up
-            (tile_x + 1, tile_y, "right"), # Right
-            (tile_x, tile_y + 1, "down"),  # Down
-            (tile_x - 1, tile_y, "left")   # Left
-        ]
-
-        directions = ["up", "right", "down", "left"]
-        direction_index = {dir: idx for idx, dir in enumerate(directions)}
-        current_direction_idx = direction_index[self.direction]
-        opposite_direction_idx = (current_direction_idx + 2) % 4
-
-        passable_neighbors = [
-            (nx, ny, direction) for (nx, ny, direction) in neighbors
-            if 0 <= ny < len(level) and 0 <= nx < len(level[0]) and level[ny][nx] not in wall_values
-        ]
-
-        filtered_neighbors = [
-            (nx, ny, direction) for (nx, ny, direction) in passable_neighbors 
-            if direction_index[direction] != opposite_direction_idx
-        ]
-
-        if len(passable_neighbors) >= 1:
-            distances = [
-                (direction, (target[0] - nx) ** 2 + (target[1] - ny) ** 2)
-                for (nx, ny, direction) in filtered_neighbors
-            ]
-            distances.sort(key=lambda item: (item[1], self.direction_priority(item[0])))
-
-            if distances and self.is_close_to_center(x, y):
-                self.rect.centerx = (tile_x + 0.5) * TILE_SIZE
-                self.rect.centery = (tile_y + 0.5) * TILE_SIZE
-                best_direction = distances[0][0]
-                self.direction = best_direction
+        # Legal exits come from the level's shared exit table, already in PRIORITIES order
+        exits = navigation.exits(tile_x, tile_y, self.direction)
+
+        if exits and self.is_close_to_center(x, y):
+            self.rect.centerx = (tile_x + 0.5) * TILE_SIZE
+            self.rect.centery = (tile_y + 0.5) * TILE_SIZE
+            if len(exits) == 1:
+                # Corridor or corner: the only legal move, no target maths needed
+                self.direction = exits[0][2]
+            elif self.mode == FRIGHTENED and mode_scheduler:
+                self.direction = self.random_turn(exits, mode_scheduler.next_turn())
+            elif distance_field:
+                # Maze distance to the target from the shared BFS field
+                self.direction = min(exits, key=lambda exit: distance_field[exit[1] * navigation.width + exit[0]])[2]
+            else:
+                # min() keeps the first of equally close exits, i.e. the higher priority one
+                self.direction = min(exits, key=lambda exit: (target[0] - exit[0]) ** 2 + (target[1] - exit[1]) ** 2)[2]
+
+    def random_turn(self, exits, preferred):
+        # Take the table's heading if it is open, else the next open one in priority order
+        open_directions = {exit[2] for exit in exits}
+        for offset in range(len(HEADINGS)):
+            direction = HEADINGS[(preferred + offset) % len(HEADINGS)]
+            if direction in open_directions:
+                return direction
 
     def is_close_to_center(self, x, y):
         tolerance = 2
@@ -104,37 +95,34 @@ class Ghost(pygame.sprite.Sprite):
         tile_center_y = (y // TILE_SIZE) * TILE_SIZE + TILE_SIZE // 2
         return abs(x - tile_center_x) < tolerance and abs(y - tile_center_y) < tolerance
 
-    def direction_priority(self, direction):
-        priorities = {"up": 1, "left": 2, "down": 3, "right": 4}
-        return priorities[direction]
-
     def calculate_movement(self):
         self.velocity = pygame.Vector2(0, 0)
+        speed = FRIGHTENED_SPEED if self.mode == FRIGHTENED else self.move_speed
         if self.direction == "left":
-            self.velocity.x = -self.move_speed
+            self.velocity.x = -speed
         elif self.direction == "right":
-            self.velocity.x = self.move_speed
+            self.velocity.x = speed
         elif self.direction == "up":
-            self.velocity.y = -self.move_speed
+            self.velocity.y = -speed
         elif self.direction == "down":
-            self.velocity.y = self.move_speed
+            self.velocity.y = speed
 
-    def move(self, movement, walls):
+    def move(self, movement, collision_grid):
         self.rect.x += movement.x
-        collision = pygame.sprite.spritecollideany(self, walls)
+        collision = collision_grid.collide(self.rect)
         if collision:
             if movement.x > 0:
-                self.rect.right = collision.rect.left
+                self.rect.right = collision.left
             elif movement.x < 0:
-                self.rect.left = collision.rect.right
+                self.rect.left = collision.right
 
         self.rect.y += movement.y
-        collision = pygame.sprite.spritecollideany(self, walls)
+        collision = collision_grid.collide(self.rect)
         if collision:
             if movement.y > 0:
-                self.rect.bottom = collision.rect.top
+                self.rect.bottom = collision.top
             elif movement.y < 0:
-                self.rect.top = collision.rect.bottom
+                self.rect.top = collision.bottom
 
     def teleport(self, x, y, width, height):
         if x == -1 or x == width:
@@ -142,25 +130,29 @@ class Ghost(pygame.sprite.Sprite):
         elif y == -1 or y == height:
             self.rect.centery = (height - abs(y) + 0.5) * TILE_SIZE
 
-    def draw(self, screen):
+    def animate(self, time):
+        frames = self.frightened_frames if self.mode == FRIGHTENED else self.frames[self.direction]
+        self.image = frames[self.animation.frame_at(time - self.animation_start)]
+
+    def draw(self, screen, offset=(0, 0)):
         # Calculate the top-left position to blit the image centered on the rect
-        top_left_x = self.rect.centerx - self.image.get_width() / 2
-        top_left_y = self.rect.centery - self.image.get_height() / 2
-        screen.blit(self.image, (top_left_x, top_left_y))
+        top_left_x = self.rect.centerx - self.image.get_width() / 2 - offset[0]
+        top_left_y = self.rect.centery - self.image.get_height() / 2 - offset[1]
+        return screen.blit(self.image, (top_left_x, top_left_y))
 
 # Define the subclasses
 class Blinky(Ghost):
-    def __init__(self, x, y):
-        super().__init__(x, y, "blinky", (27, 1))
+    def __init__(self, x, y, headless=False):
+        super().__init__(x, y, "blinky", (27, 1), headless)
 
 class Pinky(Ghost):
-    def __init__(self, x, y):
-        super().__init__(x, y, "pinky", (0, 1))
+    def __init__(self, x, y, headless=False):
+        super().__init__(x, y, "pinky", (0, 1), headless)
 
 class Inky(Ghost):
-    def __init__(self, x, y):
-        super().__init__(x, y, "inky", (27, 29))
+    def __init__(self, x, y, headless=False):
+        super().__init__(x, y, "inky", (27, 29), headless)
 
 class Clyde(Ghost):
-    def __init__(self, x, y):
-        super().__init__(x, y, "clyde", (0, 29))
+    def __init__(self, x, y, headless=False):
+        super().__init__(x, y, "clyde", (0, 29), headless)
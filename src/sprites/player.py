@@ -1,62 +1,64 @@
 import pygame
 import os
 from settings import TILE_SIZE
+from pellets import PELLET_POINTS
+from asset_manager import assets
+from animation import PLAYER_CHOMP
+
+ARROW_IMAGE = "assets/images/other/arrow.png"
 
 class Player(pygame.sprite.Sprite):
     SCALE = 1.25
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, headless=False):
         super().__init__()
+        self.headless = headless
         self.direction = "right"
         self.desired_direction = "right"
-        self.frame_index = 0
-        self.animation_frames = []
-        self.load_images()
-        self.image = self.animation_frames[self.frame_index]
-        self.original_image = self.image  # Store the original image for rotation
-        self.arrow_image = pygame.image.load("assets/images/other/arrow.png").convert_alpha()
         self.angles = {
             "right": [0, (TILE_SIZE, 0)],
             "up": [90, (0, -TILE_SIZE)],
             "left": [180, (-TILE_SIZE, 0)],
             "down": [270, (0, TILE_SIZE)]
         }
+        self.frames = {}  # direction -> pre-rotated animation frames
+        self.arrows = {}  # direction -> pre-rotated direction arrow
+        self.image = None
+        if not headless:
+            self.load_images()
+            self.image = self.frames[self.direction][0]
         self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        self.animation_timer = 0
-        self.animation_delay = 6  # Adjust speed of animation
+        self.animation = PLAYER_CHOMP
+        self.animation_start = 0  # Game time the animation is counted from
         self.move_speed = 200  # Adjust speed of movement (pixels per second)
         self.velocity = pygame.Vector2(0, 0)
         self.score = 0
+        self.last_eaten = 0  # Pellet kind eaten this update, 0 for none
 
     def load_images(self):
-        # Load images (one set of images)
+        # Every frame x direction combination is rotated once here, never per frame
         base_path = "assets/images/pacman"
         size = (TILE_SIZE * self.SCALE, TILE_SIZE * self.SCALE)
-        for i in range(1, 4):
-            image_path = os.path.join(base_path, f"{i}.png")
-            image = pygame.image.load(image_path).convert_alpha()
-            image = pygame.transform.scale(image, size)
-            self.animation_frames.append(image)
+        angles = {direction: angle for direction, (angle, _) in self.angles.items()}
+        image_paths = [os.path.join(base_path, f"{i}.png") for i in range(1, 4)]
+        self.frames = assets.variants(image_paths, size, angles)
+        self.arrows = {direction: frames[0] for direction, frames in assets.variants([ARROW_IMAGE], (TILE_SIZE, TILE_SIZE), angles).items()}
 
-    def update(self, keys, level, walls, scores, delta_time):
+    def update(self, level, collision_grid, pellets, delta_time):
         center_x, center_y = self.rect.center
         tile_x = center_x // TILE_SIZE
         tile_y = center_y // TILE_SIZE
-        # Set desired direction based on key presses
-        self.set_desired_direction(keys)
         # Check if we can turn to the desired direction
         self.check_turning(tile_x, tile_y, center_x, center_y, level)
         # Calculate current direction movement
         self.calculate_movement()
         # Apply movement and check for collisions
         if self.velocity.length() > 0:
-            self.move(self.velocity * delta_time, walls)
+            self.move(self.velocity * delta_time, collision_grid)
         # Check for boundary collisions and teleport if needed
         self.teleport(tile_x, tile_y, len(level[0]), len(level))
-        # Update animation frames
-        self.update_animation()
         # Check for score collisions and update score
-        self.score_collision(scores)
+        self.last_eaten = self.score_collision(pellets)
 
     def set_desired_direction(self, keys):
         if keys[pygame.K_LEFT]:
@@ -100,37 +102,31 @@ class Player(pygame.sprite.Sprite):
         elif self.direction == "down":
             self.velocity.y = self.move_speed
 
-    def move(self, movement, walls):
+    def move(self, movement, collision_grid):
         self.rect.x += movement.x
-        collision = pygame.sprite.spritecollideany(self, walls)
+        collision = collision_grid.collide(self.rect)
         if collision:
             if movement.x > 0:
-                self.rect.right = collision.rect.left
+                self.rect.right = collision.left
             elif movement.x < 0:
-                self.rect.left = collision.rect.right
+                self.rect.left = collision.right
         self.rect.y += movement.y
-        collision = pygame.sprite.spritecollideany(self, walls)
+        collision = collision_grid.collide(self.rect)
         if collision:
             if movement.y > 0:
-                self.rect.bottom = collision.rect.top
+                self.rect.bottom = collision.top
             elif movement.y < 0:
-                self.rect.top = collision.rect.bottom
+                self.rect.top = collision.bottom
 
-    def update_animation(self):
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_delay:
-            self.animation_timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.animation_frames)
-            self.image = self.animation_frames[self.frame_index]
-            self.original_image = self.image  # Update the original image
-        # Rotate the image based on the direction
-        self.image = pygame.transform.rotate(self.original_image, self.angles[self.direction][0])
+    def animate(self, time):
+        # Called only before drawing, so headless and fast-forward runs never touch animation
+        self.image = self.frames[self.direction][self.animation.frame_at(time - self.animation_start)]
 
-    def score_collision(self, scores):
-        collided_score = pygame.sprite.spritecollideany(self, scores)
-        if collided_score:
-            scores.remove(collided_score)
-            self.score += 1
+    def score_collision(self, pellets):
+        eaten = pellets.eat(self.rect)
+        if eaten:
+            self.score += PELLET_POINTS[eaten]
+        return eaten
 
     def teleport(self, x, y, width, height):
         if x == -1 or x == width:
@@ -139,15 +135,13 @@ class Player(pygame.sprite.Sprite):
             self.rect.centery = (height - abs(y) + 0.5) * TILE_SIZE
 
     def draw_direction_arrow(self):
-        arrow_image = pygame.transform.scale(self.arrow_image, (TILE_SIZE, TILE_SIZE))
-        angle = self.angles[self.desired_direction][0]
-        rotated_arrow = pygame.transform.rotate(arrow_image, angle)
+        rotated_arrow = self.arrows[self.desired_direction]
         offset = self.angles[self.desired_direction][1]
         arrow_rect = rotated_arrow.get_rect(center=(self.rect.centerx + offset[0], self.rect.centery + offset[1]))
         return rotated_arrow, arrow_rect.topleft
 
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
         # Calculate the top-left position to blit the image centered on the rect
-        top_left_x = self.rect.centerx - self.image.get_width() / 2
-        top_left_y = self.rect.centery - self.image.get_height() / 2
-        screen.blit(self.image, (top_left_x, top_left_y))
+        top_left_x = self.rect.centerx - self.image.get_width() / 2 - offset[0]
+        top_left_y = self.rect.centery - self.image.get_height() / 2 - offset[1]
+        return screen.blit(self.image, (top_left_x, top_left_y))
@@ -0,0 +1,153 @@
+import numpy as np
+from navigation import HEADINGS
+from modes import SCATTER, CHASE, FRIGHTENED
+from settings import GHOST_SPEED, FRIGHTENED_SPEED
+
+# Headings are stored as indices in PRIORITIES order (navigation.HEADINGS), so argmin
+# over the four candidate exits breaks distance ties exactly like Ghost.find_closest_neighbor
+HEADING_DX = np.array([0, -1, 0, 1])
+HEADING_DY = np.array([-1, 0, 1, 0])
+OPPOSITE_HEADINGS = (np.arange(4) + 2) % 4
+MODES = [SCATTER, CHASE, FRIGHTENED]
+PADDING = 2  # Off-grid tiles around the map, reached mid-teleport
+FAR = np.iinfo(np.int64).max
+
+def round_half_away(values):
+    # pygame.Rect rounds float coordinates half away from zero
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+def padded_grid(width, height, cells):
+    # cells: flat row-major bytes, nonzero where set
+    return np.pad(np.frombuffer(cells, dtype=np.uint8).reshape(height, width) != 0, PADDING)
+
+class GhostSwarm:
+    def __init__(self, navigation, collision_grid, positions, headings, scatter_targets, move_speed=GHOST_SPEED):
+        self.tile_size = collision_grid.tile_size
+        self.width = navigation.width
+        self.height = navigation.height
+        self.passable = padded_grid(navigation.width, navigation.height, navigation.cells)
+        self.walls = padded_grid(collision_grid.width, collision_grid.height, collision_grid.cells)
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        self.x = positions[:, 0].copy()
+        self.y = positions[:, 1].copy()
+        self.headings = np.array([HEADINGS.index(heading) for heading in headings], dtype=np.int64)
+        scatter_targets = np.asarray(scatter_targets, dtype=np.int64).reshape(-1, 2)
+        self.scatter_x = scatter_targets[:, 0]
+        self.scatter_y = scatter_targets[:, 1]
+        self.target_x = self.scatter_x.copy()
+        self.target_y = self.scatter_y.copy()
+        self.modes = np.zeros(len(self.x), dtype=np.int8)
+        self.move_speed = move_speed
+
+    @classmethod
+    def from_ghosts(cls, ghosts, navigation, collision_grid):
+        ghosts = list(ghosts)
+        swarm = cls(
+            navigation, collision_grid,
+            [ghost.rect.topleft for ghost in ghosts],
+            [ghost.direction for ghost in ghosts],
+            [ghost.scatter_target for ghost in ghosts],
+            ghosts[0].move_speed if ghosts else GHOST_SPEED  # Levels may have no ghosts
+        )
+        swarm.modes[:] = [MODES.index(ghost.mode) for ghost in ghosts]
+        return swarm
+
+    def __len__(self):
+        return len(self.x)
+
+    def lookup(self, grid, tile_x, tile_y):
+        rows, columns = grid.shape
+        return grid[np.clip(tile_y + PADDING, 0, rows - 1), np.clip(tile_x + PADDING, 0, columns - 1)]
+
+    def set_mode(self, mode):
+        # Same as Ghost.set_mode: entering frightened mode reverses every ghost not already in it
+        index = MODES.index(mode)
+        if mode == FRIGHTENED:
+            self.headings = np.where(self.modes != index, OPPOSITE_HEADINGS[self.headings], self.headings)
+        self.modes[:] = index
+
+    def update_target(self, player_pos):
+        chasing = self.modes == MODES.index(CHASE)
+        scattering = self.modes == MODES.index(SCATTER)
+        self.target_x = np.where(chasing, player_pos[0], np.where(scattering, self.scatter_x, self.target_x))
+        self.target_y = np.where(chasing, player_pos[1], np.where(scattering, self.scatter_y, self.target_y))
+        return chasing
+
+    def caught(self, tile):
+        size = self.tile_size
+        on_tile = ((self.x + size // 2) // size == tile[0]) & ((self.y + size // 2) // size == tile[1])
+        return bool(np.any(on_tile & (self.modes != MODES.index(FRIGHTENED))))
+
+    def update(self, delta_time, player_pos, distance_field=None, mode_scheduler=None):
+        size = self.tile_size
+        chasing = self.update_target(player_pos)
+        frightened = self.modes == MODES.index(FRIGHTENED)
+        center_x = self.x + size // 2
+        center_y = self.y + size // 2
+        tile_x = center_x // size
+        tile_y = center_y // size
+
+        # Legal exits and their distance to the target for every ghost x heading at once
+        next_x = tile_x[:, None] + HEADING_DX
+        next_y = tile_y[:, None] + HEADING_DY
+        legal = self.lookup(self.passable, next_x, next_y) & (np.arange(4) != OPPOSITE_HEADINGS[self.headings][:, None])
+        distances = (self.target_x[:, None] - next_x) ** 2 + (self.target_y[:, None] - next_y) ** 2
+        if distance_field is not None:
+            field = np.frombuffer(distance_field, dtype=np.uint16)
+            cells = np.clip(next_y, 0, self.height - 1) * self.width + np.clip(next_x, 0, self.width - 1)
+            distances = np.where(chasing[:, None], field[cells].astype(np.int64), distances)
+        best = np.argmin(np.where(legal, distances, FAR), axis=1)
+
+        tolerance = 2
+        centered = (np.abs(center_x - (tile_x * size + size // 2)) < tolerance) & (np.abs(center_y - (tile_y * size + size // 2)) < tolerance)
+        turning = legal.any(axis=1) & centered
+        if mode_scheduler and frightened.any():
+            # Ghost.random_turn for every frightened ghost at a junction; table entries are
+            # handed out in ghost order, the order the sprite group would draw them in
+            deciding = np.flatnonzero(turning & frightened & (legal.sum(axis=1) > 1))
+            if len(deciding):
+                preferred = np.array(mode_scheduler.next_turns(len(deciding)))
+                rotated = (preferred[:, None] + np.arange(4)) % 4
+                first_open = np.argmax(legal[deciding[:, None], rotated], axis=1)
+                best[deciding] = rotated[np.arange(len(deciding)), first_open]
+        self.x = np.where(turning, round_half_away((tile_x + 0.5) * size) - size // 2, self.x)
+        self.y = np.where(turning, round_half_away((tile_y + 0.5) * size) - size // 2, self.y)
+        self.headings = np.where(turning, best, self.headings)
+
+        speed = np.where(frightened, float(FRIGHTENED_SPEED), float(self.move_speed))
+        self.move(HEADING_DX[self.headings] * speed * delta_time, HEADING_DY[self.headings] * speed * delta_time)
+        self.teleport(tile_x, tile_y)
+
+    def move(self, movement_x, movement_y):
+        # Ghost.move for everyone: the first wall in row-major order under the rect clamps it
+        size = self.tile_size
+        self.x = round_half_away(self.x + movement_x)
+        left, right = self.x // size, (self.x + size - 1) // size
+        top, bottom = self.y // size, (self.y + size - 1) // size
+        top_left, top_right = self.lookup(self.walls, left, top), self.lookup(self.walls, right, top)
+        bottom_left, bottom_right = self.lookup(self.walls, left, bottom), self.lookup(self.walls, right, bottom)
+        hit = top_left | top_right | bottom_left | bottom_right
+        column = np.where(top_left, left, np.where(top_right, right, np.where(bottom_left, left, right)))
+        self.x = np.where(hit & (movement_x > 0), column * size - size, np.where(hit & (movement_x < 0), (column + 1) * size, self.x))
+
+        self.y = round_half_away(self.y + movement_y)
+        left, right = self.x // size, (self.x + size - 1) // size
+        top, bottom = self.y // size, (self.y + size - 1) // size
+        top_hit = self.lookup(self.walls, left, top) | self.lookup(self.walls, right, top)
+        hit = top_hit | self.lookup(self.walls, left, bottom) | self.lookup(self.walls, right, bottom)
+        row = np.where(top_hit, top, bottom)
+        self.y = np.where(hit & (movement_y > 0), row * size - size, np.where(hit & (movement_y < 0), (row + 1) * size, self.y))
+
+    def teleport(self, tile_x, tile_y):
+        size = self.tile_size
+        wrap_x = (tile_x == -1) | (tile_x == self.width)
+        wrap_y = ~wrap_x & ((tile_y == -1) | (tile_y == self.height))
+        self.x = np.where(wrap_x, round_half_away((self.width - np.abs(tile_x) + 0.5) * size) - size // 2, self.x)
+        self.y = np.where(wrap_y, round_half_away((self.height - np.abs(tile_y) + 0.5) * size) - size // 2, self.y)
+
+    def write_back(self, ghosts):
+        # Copy batched state onto the sprites, only needed when they are drawn
+        for ghost, x, y, heading, mode in zip(ghosts, self.x.tolist(), self.y.tolist(), self.headings.tolist(), self.modes.tolist()):
+            ghost.rect.topleft = (x, y)
+            ghost.direction = HEADINGS[heading]
+            ghost.mode = MODES[mode]
@@ -0,0 +1,36 @@
+from collections import OrderedDict
+import settings
+
+class TextCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()  # (font, text, color, size) -> (surface, rect), least recently used first
+        self.hits = 0
+        self.misses = 0  # Every miss is one freetype rasterization
+
+    def render(self, font, text, color, size):
+        key = (font, text, tuple(color), size)
+        entry = self.surfaces.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = font.render(text, color, size=size)
+            self.surfaces[key] = entry
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        surface, rect = entry
+        # Callers position the rect in place, so each gets its own copy
+        return surface, rect.copy()
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.surfaces)}
+
+text_cache = TextCache(settings.TEXT_CACHE_SIZE)
+
+def render_text(font, text, color, size):
+    return text_cache.render(font, text, color, size)